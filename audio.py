@@ -0,0 +1,120 @@
+# audio.py — składanie audio medytacji fragmentami
+#
+# Tekst -> kawałki (po zdaniach) -> dla każdego: synteza, cisza pauzy, głośność, tło, eksport MP3.
+# Pierwszy kawałek jest gotowy do odsłuchu, zanim ruszą kolejne. Pełny plik
+# to sklejenie bajtów fragmentów MP3 (bez ponownego kodowania) — dlatego
+# wszystkie fragmenty są eksportowane z tymi samymi parametrami i bez
+# nagłówków Xing/ID3, które w środku pliku psułyby długość nagrania.
+import os
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Iterator, List, Sequence, Tuple
+
+from pydub import AudioSegment
+
+from tts_backends import TTSBackend
+
+FRAME_RATE = 44100
+CHANNELS = 2
+MP3_PARAMS = ["-write_xing", "0", "-id3v2_version", "0"]
+BITRATE = "128k"
+
+
+@dataclass
+class RenderedSegment:
+    index: int
+    total: int
+    path: str
+    duration_ms: int
+    elapsed: float          # sekundy od startu renderowania do gotowego pliku
+
+
+def chunk_sentences(sentences: List[str], first_chars: int = 160, max_chars: int = 600) -> List[str]:
+    """Łączy zdania w kawałki do syntezy; pierwszy jest krótki, żeby szybko zagrał."""
+    chunks, current = [], ""
+    limit = first_chars
+    for s in sentences:
+        if current and len(current) + 1 + len(s) > limit:
+            chunks.append(current)
+            current, limit = "", max_chars
+        current = f"{current} {s}" if current else s
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_with_pauses(
+    pieces: List[Tuple[List[str], int]], first_chars: int = 160, max_chars: int = 600
+) -> Tuple[List[str], List[int]]:
+    """
+    Jak chunk_sentences, ale dla odcinków (zdania, sekundy pauzy po nich):
+    kawałek zawsze kończy się tam, gdzie pauza. Zwraca (kawałki, cisza w ms po każdym).
+    """
+    chunks, pauses_ms = [], []
+    for sentences, pause_s in pieces:
+        part = chunk_sentences(sentences, first_chars if not chunks else max_chars, max_chars)
+        if part:
+            chunks += part
+            pauses_ms += [0] * (len(part) - 1) + [pause_s * 1000]
+        elif pauses_ms:
+            pauses_ms[-1] += pause_s * 1000  # pauza tuż po pauzie
+    return chunks, pauses_ms
+
+
+def _looped_slice(bg: AudioSegment, start_ms: int, length_ms: int) -> AudioSegment:
+    """Wycinek zapętlonego tła [start, start+length) — tło płynie ciągle przez fragmenty."""
+    start_ms %= len(bg)
+    out = bg[start_ms:start_ms + length_ms]
+    while len(out) < length_ms:
+        out += bg[:length_ms - len(out)]
+    return out
+
+
+def render_segments(
+    chunks: List[str],
+    tts: TTSBackend,
+    out_dir: str,
+    prefix: str,
+    bg: AudioSegment | None = None,
+    v_gain_db: float = 0,
+    fade_in_ms: int = 0,
+    fade_out_ms: int = 0,
+    pauses_ms: Sequence[int] | None = None,
+) -> Iterator[RenderedSegment]:
+    """Renderuje kawałki po kolei i oddaje każdy, gdy tylko jest zapisany; pauses_ms[i] = cisza po kawałku i."""
+    t0 = time.perf_counter()
+    bg_pos = 0
+    total = len(chunks)
+    for i, chunk in enumerate(chunks):
+        voice = AudioSegment.from_file(BytesIO(tts.synthesize(chunk)), format=tts.format).apply_gain(v_gain_db)
+        voice = voice.set_frame_rate(FRAME_RATE).set_channels(CHANNELS)
+        if pauses_ms and pauses_ms[i]:
+            # cisza w głosie, tło gra dalej
+            voice += AudioSegment.silent(pauses_ms[i], frame_rate=FRAME_RATE).set_channels(CHANNELS)
+
+        if bg is not None:
+            mixed = voice.overlay(_looped_slice(bg, bg_pos, len(voice)))
+            bg_pos += len(voice)
+        else:
+            mixed = voice
+
+        if i == 0 and fade_in_ms:
+            mixed = mixed.fade_in(min(fade_in_ms, len(mixed)))
+        if i == total - 1 and fade_out_ms:
+            mixed = mixed.fade_out(min(fade_out_ms, len(mixed)))
+
+        path = os.path.join(out_dir, f"{prefix}_{i:03d}.mp3")
+        mixed.export(path, format="mp3", bitrate=BITRATE, parameters=MP3_PARAMS)
+        yield RenderedSegment(i, total, path, len(mixed), time.perf_counter() - t0)
+
+
+def concat_mp3(paths: List[str], out_path: str, remove_parts: bool = True) -> str:
+    """Skleja fragmenty MP3 bajt po bajcie (ramki MP3 są niezależne)."""
+    with open(out_path, "wb") as out:
+        for p in paths:
+            with open(p, "rb") as f:
+                out.write(f.read())
+            if remove_parts:
+                os.remove(p)
+    return out_path
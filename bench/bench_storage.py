@@ -0,0 +1,68 @@
+# bench/bench_storage.py — rozmiar i czas odczytu health_data.json: v1 vs v2
+#
+#   python bench/bench_storage.py [dni] [light|hard]
+#
+# Generuje historię (domyślnie 1000 dni w trybie light: 3 zadania dziennie),
+# zapisuje ją w starym formacie v1 (indent=2) i w kolumnowym v2, po czym mierzy
+# rozmiar pliku, sam json.loads oraz pełny odczyt (json.loads + migrate).
+import datetime as dt
+import json
+import random
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import storage  # noqa: E402
+
+
+def history_v1(n_days: int, n_tasks: int) -> dict:
+    rng = random.Random(42)
+    days = {}
+    for i in range(n_days):
+        date = (dt.date(2022, 1, 1) + dt.timedelta(days=i)).isoformat()
+        days[date] = {
+            "done": {t: rng.random() < 0.6 for t in storage.TASK_REGISTRY[:n_tasks]},
+            "water_ml": rng.choice([0, 250, 500, 1000, 1500, 2000]),
+            "notes": "",
+            "bonus": rng.choice(storage.BONUS_REGISTRY),
+        }
+    return {"days": days, "challenge": {"start_date": "2022-01-01"}, "user": {"name": "Ala", "goals": []}}
+
+
+def best_ms(fn, number: int = 50) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=25)) / number * 1000
+
+
+def paired_ratio(slow, fast, number: int = 50, pairs: int = 25) -> float:
+    """Mediana ilorazów z naprzemiennych pomiarów — odporna na szum innych procesów."""
+    ratios = []
+    for _ in range(pairs):
+        ratios.append(timeit.timeit(slow, number=number) / timeit.timeit(fast, number=number))
+    return statistics.median(ratios)
+
+
+def main():
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_tasks = 10 if len(sys.argv) > 2 and sys.argv[2] == "hard" else 3
+
+    v1 = json.dumps(history_v1(n_days, n_tasks), ensure_ascii=False, indent=2)
+    v2 = storage.dumps(storage.migrate(json.loads(v1)))
+
+    rows = [
+        ("v1", v1, best_ms(lambda: json.loads(v1)), best_ms(lambda: storage.migrate(json.loads(v1)), 5)),
+        ("v2", v2, best_ms(lambda: json.loads(v2)), best_ms(lambda: storage.migrate(json.loads(v2)))),
+    ]
+    print(f"{n_days} dni, {n_tasks} zadań dziennie")
+    print(f"{'format':8s} {'KB':>8s} {'loads ms':>9s} {'+migrate ms':>12s}")
+    for name, text, loads_ms, read_ms in rows:
+        print(f"{name:8s} {len(text.encode()) / 1024:8.1f} {loads_ms:9.2f} {read_ms:12.2f}")
+    (_, t1, _, _), (_, t2, _, _) = rows
+    loads_x = paired_ratio(lambda: json.loads(v1), lambda: json.loads(v2))
+    read_x = paired_ratio(lambda: json.loads(v1), lambda: storage.migrate(json.loads(v2)))
+    print(f"mniejszy plik: {len(t1.encode()) / len(t2.encode()):.1f}x, "
+          f"json.loads: {loads_x:.1f}x, odczyt v2 (loads + walidacja) vs loads v1: {read_x:.1f}x  (mediany par)")
+
+if __name__ == "__main__":
+    main()
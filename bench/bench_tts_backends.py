@@ -0,0 +1,56 @@
+# bench/bench_tts_backends.py — przepustowość silników TTS
+#
+#   python bench/bench_tts_backends.py [gtts espeak fake ...]
+#
+# Dla każdego dostępnego backendu syntezuje te same kawałki medytacji
+# i podaje: czas do pierwszego kawałka, łączny czas i znaki/s.
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from audio import chunk_sentences  # noqa: E402
+from tts_backends import BACKENDS, get_backend  # noqa: E402
+from tts_text import split_sentences  # noqa: E402
+
+TEXT = (
+    "Usiądź wygodnie i zamknij oczy. Weź głęboki wdech przez nos i powoli wypuść powietrze ustami. "
+    "Poczuj ciężar ciała na krześle. Skieruj uwagę na stopy, łydki i kolana. "
+    "Z każdym wydechem pozwól, by napięcie odpływało. Oddychaj spokojnie, w swoim rytmie. "
+    "Kiedy myśli odpływają, łagodnie wróć do oddechu. Kiedy będziesz gotowy, powoli otwórz oczy. "
+) * 4
+
+
+def bench(name: str, chunks) -> None:
+    backend = get_backend(name)
+    if not backend.available():
+        print(f"{name:8s} niedostępny — pomijam")
+        return
+    chars = sum(len(c) for c in chunks)
+    t0 = time.perf_counter()
+    first = None
+    total_bytes = 0
+    for chunk in chunks:
+        total_bytes += len(backend.synthesize(chunk))
+        if first is None:
+            first = time.perf_counter() - t0
+    total = time.perf_counter() - t0
+    print(
+        f"{name:8s} kawałków {len(chunks):3d}  pierwszy {first * 1000:8.1f} ms  "
+        f"razem {total:7.2f} s  {chars / total:9.0f} znaków/s  {total_bytes / 1024:8.0f} KiB {backend.format}"
+    )
+
+
+def main():
+    names = sys.argv[1:] or list(BACKENDS)
+    chunks = chunk_sentences(split_sentences(TEXT))
+    print(f"tekst: {sum(len(c) for c in chunks)} znaków")
+    for name in names:
+        try:
+            bench(name, chunks)
+        except Exception as e:
+            print(f"{name:8s} błąd: {e}")
+
+
+if __name__ == "__main__":
+    main()
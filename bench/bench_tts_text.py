@@ -0,0 +1,95 @@
+# bench/bench_tts_text.py — normalize_for_tts vs stare clean_markdown_for_tts + strip_pause_words
+#
+#   python bench/bench_tts_text.py [MB]
+#
+# Porównuje wynik (musi być identyczny na tekście bez emoji) i czas na
+# tekście ~MB megabajtów, plus przypadek patologiczny dla starego regexu linków.
+# Na zwykłym tekście nowa wersja jest wolniejsza (ok. 229 vs 140 ms na 1 MB);
+# wygrywa tylko w przypadku patologicznym. Zgodność pilnuje tests/test_tts_text.py.
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tts_text import normalize_for_tts  # noqa: E402
+
+
+# --- stara implementacja (z app.py), tylko do porównania ---
+def clean_markdown_for_tts(text: str) -> str:
+    text = re.sub(r"[*_`#>]+", " ", text)
+    text = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", text)
+    text = re.sub(r"\s{2,}", " ", text).strip()
+    return text
+
+
+def strip_pause_words(text: str) -> str:
+    text = re.sub(r"\[?\(?\s*pauza\s*\d+\s*(sekundy|sekund|sek|s)?\s*\)?\]?", " ", text, flags=re.IGNORECASE)
+    text = re.sub(r"\b[pP]auza\b", " ", text)
+    text = re.sub(r"\b[pP]auza\s*\d+\s*s(ek)?\b", " ", text)
+    text = re.sub(r"\s{2,}", " ", text).strip()
+    return text
+
+
+def legacy(text: str) -> str:
+    return strip_pause_words(clean_markdown_for_tts(text))
+
+
+LINES = [
+    "## Wprowadzenie",
+    "Usiądź wygodnie i zamknij oczy.",
+    "**Weź głęboki wdech** przez nos… i powoli wypuść powietrze ustami.",
+    "[PAUZA 10]",
+    "Poczuj ciężar ciała na krześle. (pauza 5s)",
+    "> Każdy oddech przybliża Cię do spokoju.",
+    "Skieruj uwagę na stopy, *łydki* i kolana.",
+    "Pauza.",
+    "Zobacz [nagranie](https://example.com/oddech) i wróć do oddechu.",
+    "Oddychaj spokojnie - pauza 3 sekundy - i poczuj przestrzeń w klatce piersiowej.",
+    "Napnij mięśnie ramion, przytrzymaj; rozluźnij.",
+    "",
+    "1. Wdech na cztery.  2. Zatrzymanie.   3. Wydech na sześć.",
+    "Kiedy będziesz gotowy, powoli otwórz oczy!",
+]
+
+
+def corpus(size: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    out, total = [], 0
+    while total < size:
+        line = rnd.choice(LINES)
+        out.append(line)
+        total += len(line) + 1
+    return "\n".join(out)
+
+
+def timed(fn, text, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    mb = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    text = corpus(int(mb * 1_000_000))
+
+    t_old, out_old = timed(legacy, text)
+    t_new, out_new = timed(normalize_for_tts, text)
+    print(f"tekst: {len(text) / 1e6:.2f} M znaków")
+    print(f"stare (7 regexów): {t_old * 1000:8.1f} ms")
+    print(f"normalize_for_tts: {t_new * 1000:8.1f} ms")
+    print(f"identyczny wynik:  {out_old == out_new}")
+
+    # wiele '[' bez '](' w jednej linii: stary regex linku skanuje do końca linii od każdego '['
+    bad = "[a" * 5000
+    t_old, _ = timed(legacy, bad, repeat=1)
+    t_new, _ = timed(normalize_for_tts, bad, repeat=1)
+    print(f"patologiczne {len(bad)} zn.: stare {t_old * 1000:.1f} ms, nowe {t_new * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# bench/loadtest.py — N równoległych sesji przez AppTest, z lokalnymi atrapami
+#
+#   python bench/loadtest.py 1 5 10 20
+#
+# Każda sesja to osobny AppTest (własne session_state) klikający:
+#   start -> Motywator zdrowia (checkbox, +250 ml) -> start -> Mind (klucz,
+#   temat, "Wszystko naraz": tekst + obraz + głos).
+# OpenAI i pobieranie obrazu są podmienione na atrapy, TTS to backend "fake".
+# Dla każdego N raportuje RSS procesu (wszystkie N sesji wciąż żyją) oraz
+# percentyle czasu reruna: sam rerun i rerun razem z czekaniem w kolejce.
+#
+# AppTest na czas run() podnosi globalny singleton Runtime, więc dwa run()
+# naraz się gryzą — reruny idą przez RUN_LOCK (jak jeden worker serwera),
+# a sesje czekają na swoją kolej w wątkach. Test mierzy więc pamięć N żywych
+# sesji i czas pojedynczego reruna + kolejkę, NIE reruny wykonywane współbieżnie
+# (raport wypisuje to w nagłówku).
+import base64
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# ---------------- ATRAPY ----------------
+# 1x1 PNG + sztuczne opóźnienia, żeby DAG i rerun miały co mierzyć
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+IMAGE_BYTES = PNG + b"\0" * 256 * 1024   # udajemy obraz ~256 KiB
+TEXT_DELAY = 0.2
+IMAGE_DELAY = 0.4
+
+RUN_LOCK = threading.Lock()
+
+
+class _Completions:
+    def create(self, **kwargs):
+        time.sleep(TEXT_DELAY)
+        text = "Usiądź wygodnie. Weź głęboki wdech. [PAUZA 5] Poczuj ciało. Powoli otwórz oczy."
+        msg = types.SimpleNamespace(content=text)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)])
+
+
+class _Images:
+    def generate(self, **kwargs):
+        time.sleep(IMAGE_DELAY)
+        return types.SimpleNamespace(data=[types.SimpleNamespace(url="fake://image.png")])
+
+
+class FakeOpenAI:
+    def __init__(self, *args, **kwargs):
+        self.chat = types.SimpleNamespace(completions=_Completions())
+        self.images = _Images()
+
+    def close(self):
+        pass
+
+
+def install_fakes() -> None:
+    import openai
+    import requests
+
+    openai.OpenAI = FakeOpenAI
+    requests.get = lambda url, **kwargs: types.SimpleNamespace(content=IMAGE_BYTES)
+    os.environ["QUESTAPP_TTS_BACKEND"] = "fake"
+
+
+# ---------------- POMIARY ----------------
+def rss_mb() -> float:
+    """Bieżący RSS procesu (Linux /proc); gdzie indziej — szczytowy z getrusage."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+# ---------------- SESJA ----------------
+def simulate_session(latencies: list, queued: list, lock: threading.Lock):
+    """Jedna sesja od startu do "Wszystko naraz" -> (AppTest, komunikaty st.error)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+
+    def step(action):
+        t0 = time.perf_counter()
+        with RUN_LOCK:
+            t1 = time.perf_counter()
+            action()
+            t2 = time.perf_counter()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        with lock:
+            latencies.append(t2 - t1)
+            queued.append(t2 - t0)
+
+    def button(prefix):
+        return next(b for b in at.button if b.label.startswith(prefix))
+
+    step(lambda: at.run())
+    # --- health ---
+    step(lambda: at.selectbox[0].set_value("health").run())
+    step(lambda: button("Wejdź").click().run())
+    step(lambda: at.checkbox[0].check().run())
+    step(lambda: button("+250").click().run())
+    # --- mind ---
+    at.session_state["room"] = "start"
+    step(lambda: at.run())
+    step(lambda: at.selectbox[0].set_value("mind").run())
+    step(lambda: button("Wejdź").click().run())
+    step(lambda: at.text_input[0].input("sk-fake").run())
+    step(lambda: at.selectbox[0].set_value("Redukcja stresu").run())
+    step(lambda: button("🚀").click().run())
+    return at, [e.value for e in at.error]
+
+
+def run_level(n: int) -> dict:
+    from blobstore import INLINE, STORE
+
+    latencies, queued, lock = [], [], threading.Lock()
+    gc.collect()
+    rss_before = rss_mb()
+    spills_before = STORE.stats()["spills"]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        sessions = list(pool.map(lambda _: simulate_session(latencies, queued, lock), range(n)))
+    wall = time.perf_counter() - t0
+    gc.collect()
+    rss_after = rss_mb()  # sesje (AppTest + session_state) jeszcze żyją
+
+    return {
+        "n": n,
+        "wall": wall,
+        "reruns": len(latencies),
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "q95": percentile(queued, 95) * 1000,
+        "rss": rss_after,
+        "rss_per_session": (rss_after - rss_before) / n,
+        "spills": STORE.stats()["spills"] - spills_before,
+        "inline_kb": INLINE.used / 1024,
+        "errors": sorted({e for _, errs in sessions for e in errs}),
+    }
+
+
+def main():
+    levels = [int(x) for x in sys.argv[1:]] or [1, 5, 10, 20]
+
+    # osobny katalog roboczy: health_data.json, meditations/, assets/ nie brudzą repo
+    workdir = Path(tempfile.mkdtemp(prefix="questapp-load-"))
+    shutil.copy(ROOT / "ciekawostki.json", workdir)
+    os.chdir(workdir)
+    sys.path.insert(0, str(ROOT))
+    install_fakes()
+
+    print(f"katalog roboczy: {workdir}")
+    print("reruny serializowane przez RUN_LOCK (AppTest) — p50/p95/p99 to pojedynczy rerun, bez współbieżności")
+    print(
+        f"{'N':>4} {'reruny':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'+kolejka p95':>13} "
+        f"{'RSS MB':>8} {'MB/sesję':>9} {'spill':>6} {'inline KiB':>11} {'czas s':>7}"
+    )
+    for n in levels:
+        r = run_level(n)
+        print(
+            f"{r['n']:>4} {r['reruns']:>7} {r['p50']:>8.0f} {r['p95']:>8.0f} {r['p99']:>8.0f} {r['q95']:>13.0f} "
+            f"{r['rss']:>8.1f} {r['rss_per_session']:>9.2f} {r['spills']:>6} {r['inline_kb']:>11.0f} {r['wall']:>7.1f}"
+        )
+        for e in r["errors"]:
+            print(f"     ! {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# blobstore.py — duże wartości sesji na dysku, w session_state tylko uchwyt
+#
+# Tekst medytacji czy PNG z DALL·E trzymane w st.session_state żyją tak długo
+# jak sesja, więc pamięć procesu rośnie liniowo z liczbą użytkowników.
+# keep()/fetch() pilnują budżetów:
+#   - na sesję: wartości powyżej SPILL_BYTES albo ponad SESSION_BUDGET łącznie
+#     trafiają do magazynu na dysku (adresowanego treścią), a w sesji zostaje BlobRef,
+#   - na proces, wartości w sesjach: wszystkie sesje razem trzymają w session_state
+#     najwyżej INLINE_BUDGET bajtów; ponad to keep() też zapisuje na dysk
+#     (bajty sesji wracają do puli, gdy jej session_state zostanie zwolniony),
+#   - na proces, cache: ostatnio czytane bloby siedzą w RAM w LRU do PROCESS_BUDGET bajtów.
+#
+# Sprzątanie dysku:
+#   - keep() nadpisujące wartość zwalnia stary uchwyt; blob bez uchwytów znika od razu
+#     (liczniki per digest, bo ten sam tekst może trzymać kilka sesji),
+#   - sesja, która się skończyła, swoich uchwytów nie zwolni — co SWEEP_EVERY s
+#     put() usuwa bloby nieużywane dłużej niż BLOB_TTL i przycina magazyn do
+#     DISK_BUDGET (najdawniej używane najpierw). fetch() brakującego bloba
+#     zwraca default.
+import hashlib
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+BLOB_DIR = Path(os.environ.get("QUESTAPP_BLOB_DIR", Path("meditations") / "blobs"))
+SPILL_BYTES = int(os.environ.get("QUESTAPP_SPILL_BYTES", 16 * 1024))
+SESSION_BUDGET = int(os.environ.get("QUESTAPP_SESSION_BUDGET", 64 * 1024))
+PROCESS_BUDGET = int(os.environ.get("QUESTAPP_PROCESS_BUDGET", 32 * 1024 * 1024))
+INLINE_BUDGET = int(os.environ.get("QUESTAPP_INLINE_BUDGET", 16 * 1024 * 1024))
+DISK_BUDGET = int(os.environ.get("QUESTAPP_BLOB_DISK_BUDGET", 512 * 1024 * 1024))
+BLOB_TTL = float(os.environ.get("QUESTAPP_BLOB_TTL", 6 * 3600))
+SWEEP_EVERY = 60.0
+
+_INLINE_SIZES = "_blob_inline"  # klucz w session_state: _InlineSizes tej sesji
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    digest: str
+    size: int
+    text: bool = False   # True -> fetch() zwraca str (UTF-8), inaczej bytes
+
+
+class BlobStore:
+    """Magazyn adresowany sha256 z licznikiem uchwytów + LRU gorących blobów w pamięci."""
+
+    def __init__(
+        self,
+        root: Path = BLOB_DIR,
+        budget: int = PROCESS_BUDGET,
+        disk_budget: int = DISK_BUDGET,
+        ttl: float = BLOB_TTL,
+    ):
+        self.root = root
+        self.budget = budget
+        self.disk_budget = disk_budget
+        self.ttl = ttl
+        self._hot: "OrderedDict[str, bytes]" = OrderedDict()
+        self._hot_bytes = 0
+        self._refs: dict[str, int] = {}         # digest -> ile uchwytów trzymają sesje
+        self._used: dict[str, float] = {}       # digest -> time.time() ostatniego put/get
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self.spills = 0
+        self.reads = 0
+        self.hot_hits = 0
+        self.removed = 0
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes, text: bool = False) -> BlobRef:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        tmp = None
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+        with self._lock:
+            # licznik i publikacja pliku razem, żeby release() innej sesji nie skasował go w międzyczasie
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+            self._used[digest] = time.time()
+            self.spills += 1
+            if tmp is not None:
+                os.replace(tmp, path)
+            elif not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+        self.maybe_sweep()
+        return BlobRef(digest, len(data), text)
+
+    def get(self, ref: BlobRef) -> bytes:
+        """Bajty bloba; FileNotFoundError, gdy został już posprzątany."""
+        with self._lock:
+            self.reads += 1
+            self._used[ref.digest] = time.time()
+            data = self._hot.get(ref.digest)
+            if data is not None:
+                self.hot_hits += 1
+                self._hot.move_to_end(ref.digest)
+                return data
+        data = self._path(ref.digest).read_bytes()
+        self._remember(ref.digest, data)
+        return data
+
+    def release(self, ref: BlobRef) -> None:
+        """Sesja oddaje uchwyt; ostatni uchwyt -> plik i wpis w RAM znikają."""
+        with self._lock:
+            left = self._refs.get(ref.digest, 0) - 1
+            if left > 0:
+                self._refs[ref.digest] = left
+                return
+            self._drop(ref.digest)
+
+    def _drop(self, digest: str) -> None:
+        # wołane z trzymanym _lock
+        self._refs.pop(digest, None)
+        self._used.pop(digest, None)
+        old = self._hot.pop(digest, None)
+        if old is not None:
+            self._hot_bytes -= len(old)
+        try:
+            self._path(digest).unlink()
+            self.removed += 1
+        except FileNotFoundError:
+            pass
+
+    def maybe_sweep(self) -> None:
+        now = time.time()
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + SWEEP_EVERY
+        self.sweep(now)
+
+    def sweep(self, now: float | None = None) -> int:
+        """Usuwa bloby nieużywane dłużej niż ttl, potem najstarsze ponad disk_budget."""
+        now = time.time() if now is None else now
+        files = []
+        for path in self.root.glob("??/*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((path.name, st.st_size, st.st_mtime))
+
+        removed = 0
+        with self._lock:
+            # pliki z poprzednich uruchomień nie mają wpisu w _used — liczy się mtime
+            files = sorted((self._used.get(d, mtime), size, d) for d, size, mtime in files)
+            total = sum(size for _, size, _ in files)
+            for used, size, digest in files:
+                if used > now - self.ttl and total <= self.disk_budget:
+                    break
+                self._drop(digest)
+                total -= size
+                removed += 1
+        return removed
+
+    def _remember(self, digest: str, data: bytes) -> None:
+        if len(data) > self.budget:
+            return
+        with self._lock:
+            if digest in self._hot:
+                return
+            self._hot[digest] = data
+            self._hot_bytes += len(data)
+            while self._hot_bytes > self.budget:
+                _, old = self._hot.popitem(last=False)
+                self._hot_bytes -= len(old)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "spills": self.spills,
+                "reads": self.reads,
+                "hot_hits": self.hot_hits,
+                "hot_blobs": len(self._hot),
+                "hot_bytes": self._hot_bytes,
+                "budget_bytes": self.budget,
+                "live_blobs": len(self._refs),
+                "removed": self.removed,
+            }
+
+
+STORE = BlobStore()
+
+
+def _size(value) -> int:
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 0
+
+
+class InlineBudget:
+    """Licznik bajtów trzymanych bezpośrednio w session_state wszystkich sesji procesu."""
+
+    def __init__(self, limit: int = INLINE_BUDGET):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, n: int) -> bool:
+        with self._lock:
+            if self.used + n > self.limit:
+                return False
+            self.used += n
+            return True
+
+    def free(self, n: int) -> None:
+        with self._lock:
+            self.used -= n
+
+
+INLINE = InlineBudget()
+
+
+def _free_all(sizes: dict) -> None:
+    INLINE.free(sum(sizes.values()))
+
+
+class _InlineSizes:
+    """{klucz: rozmiar} jednej sesji; gdy session_state sesji znika, jej bajty wracają do INLINE."""
+
+    def __init__(self):
+        self.sizes: dict[str, int] = {}
+        weakref.finalize(self, _free_all, self.sizes)
+
+
+def keep(state, key: str, value) -> None:
+    """state[key] = value, ale duże str/bytes idą na dysk, a w stanie zostaje BlobRef."""
+    old = state.get(key)
+    if isinstance(old, BlobRef):
+        STORE.release(old)
+    inline = state.get(_INLINE_SIZES)
+    if inline is None:
+        inline = state[_INLINE_SIZES] = _InlineSizes()
+    sizes = inline.sizes
+    freed = sizes.pop(key, 0)
+    if freed:
+        INLINE.free(freed)
+    n = _size(value)
+    if n and (n > SPILL_BYTES or sum(sizes.values()) + n > SESSION_BUDGET or not INLINE.reserve(n)):
+        is_text = isinstance(value, str)
+        state[key] = STORE.put(value.encode("utf-8") if is_text else bytes(value), text=is_text)
+        return
+    if n:
+        sizes[key] = n
+    state[key] = value
+
+
+def fetch(state, key: str, default=None):
+    """Odwrotność keep(): zwraca wartość, w razie potrzeby czytając ją z magazynu."""
+    value = state.get(key, default)
+    if isinstance(value, BlobRef):
+        try:
+            data = STORE.get(value)
+        except FileNotFoundError:
+            # posprzątany (TTL / budżet dysku) — sesja zachowuje się, jakby wartości nie było
+            state[key] = default
+            return default
+        return data.decode("utf-8") if value.text else data
+    return value
+
+
+def inline_bytes(state) -> int:
+    """Ile bajtów dużych wartości ta sesja trzyma bezpośrednio w pamięci."""
+    inline = state.get(_INLINE_SIZES)
+    return sum(inline.sizes.values()) if inline is not None else 0
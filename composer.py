@@ -0,0 +1,216 @@
+# composer.py — medytacja składana z biblioteki fragmentów (bez sieci)
+#
+# Biblioteka (fragments.json) ma sekcje: intro, breath, body, core, closing.
+# Fragmenty "core" są przypisane do tematów (topics; "*" = pasuje do każdego).
+# compose() wybiera intro, oddech, rdzeń dla tematu, dopełnia body-scanem
+# i oddechem do zadanej długości, a na końcu dokłada zakończenie.
+#
+# gpt-4o-mini jest używany tylko opcjonalnie:
+#   - gdy dla tematu brakuje rdzenia, a jest klient — dopisuje jeden fragment
+#     (zapamiętany w meditations/fragments_generated.json, więc tylko raz;
+#     plik trzyma najwyżej MAX_GENERATED fragmentów, najstarsze wypadają),
+#   - refine=True — wygładza przejścia w gotowym tekście.
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+LIBRARY_FILE = Path(__file__).with_name("fragments.json")
+GENERATED_FILE = Path("meditations") / "fragments_generated.json"
+
+WORDS_PER_MIN = 100      # spokojne tempo prowadzącego
+MAX_GENERATED = 200      # fragmentów z LLM w pliku i w bibliotece
+MAX_GENERATED_CHARS = 2000  # prosimy o 60–90 słów; dłuższą odpowiedź przycinamy
+SECTIONS = ("intro", "breath", "body", "core", "closing")
+
+_PAUSE = re.compile(r"pauza\s*(\d+)", re.IGNORECASE)
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+def estimate_seconds(text: str) -> int:
+    """Szacowany czas: słowa w tempie WORDS_PER_MIN + zapisane pauzy."""
+    pauses = [int(m.group(1)) for m in _PAUSE.finditer(text)]
+    words = len(_WORD.findall(_PAUSE.sub(" ", text)))
+    return round(words * 60 / WORDS_PER_MIN + sum(pauses))
+
+
+@dataclass(frozen=True)
+class Fragment:
+    id: str
+    kind: str
+    text: str
+    topics: Tuple[str, ...] = ()
+    seconds: int = 0
+
+
+@dataclass
+class Composition:
+    text: str
+    fragments: List[Fragment] = field(default_factory=list)  # pusta, gdy tekst był wygładzany przez AI
+    seconds: int = 0
+    llm_calls: int = 0
+
+
+# ---------------- BIBLIOTEKA ----------------
+_library: Dict[str, List[Fragment]] | None = None
+# biblioteka i GENERATED_FILE są wspólne dla wszystkich sesji procesu
+_LOCK = threading.Lock()
+
+
+def _fragment(kind: str, raw: dict) -> Fragment:
+    return Fragment(
+        id=raw["id"],
+        kind=kind,
+        text=raw["text"],
+        topics=tuple(raw.get("topics", ())),
+        seconds=estimate_seconds(raw["text"]),
+    )
+
+
+def library() -> Dict[str, List[Fragment]]:
+    """Biblioteka wczytywana raz na proces (kuratorska + wcześniej wygenerowane)."""
+    global _library
+    if _library is None:
+        with _LOCK:
+            if _library is None:
+                lib = {kind: [] for kind in SECTIONS}
+                for path in (LIBRARY_FILE, GENERATED_FILE):
+                    if not path.exists():
+                        continue
+                    raw = json.loads(path.read_text(encoding="utf-8"))
+                    for kind in SECTIONS:
+                        lib[kind].extend(_fragment(kind, r) for r in raw.get(kind, []))
+                _library = lib
+    return _library
+
+
+def _norm(topic: str) -> str:
+    return " ".join(topic.lower().split())
+
+
+def core_for(topic: str) -> List[Fragment]:
+    t = _norm(topic)
+    return [f for f in library()["core"] if any(_norm(x) == t for x in f.topics)]
+
+
+def _generated_id(topic: str, text: str) -> str:
+    """Stałe ID z treści — dwie sesje nie dostaną tego samego 'gen-N' dla różnych tekstów."""
+    return "gen-" + hashlib.sha256(f"{_norm(topic)}|{text}".encode("utf-8")).hexdigest()[:12]
+
+
+def _save_generated(frag: Fragment) -> Fragment:
+    """Dopisuje fragment do biblioteki i pliku; zwraca fragment, którego należy użyć.
+
+    Jeśli inna sesja zdążyła już dopisać rdzeń dla tego tematu, zwraca tamten.
+    """
+    lib = library()
+    with _LOCK:
+        existing = core_for(frag.topics[0])
+        if existing:
+            return existing[0]
+        # nowa lista zamiast append/del — core_for() w innych wątkach czyta bez blokady
+        generated = [f.id for f in lib["core"] if f.id.startswith("gen-")]
+        dropped = set(generated[:max(0, len(generated) + 1 - MAX_GENERATED)])  # najstarsze
+        lib["core"] = [f for f in lib["core"] if f.id not in dropped] + [frag]
+
+        raw = {}
+        if GENERATED_FILE.exists():
+            raw = json.loads(GENERATED_FILE.read_text(encoding="utf-8"))
+        core = [r for r in raw.get("core", []) if r.get("id") not in dropped]
+        core.append({"id": frag.id, "topics": list(frag.topics), "text": frag.text})
+        raw["core"] = core[-MAX_GENERATED:]
+        GENERATED_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = GENERATED_FILE.with_name(GENERATED_FILE.name + ".tmp")
+        tmp.write_text(json.dumps(raw, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, GENERATED_FILE)  # czytelnik widzi stary albo nowy plik, nigdy połowę
+    return frag
+
+
+# ---------------- LLM (opcjonalnie) ----------------
+def _fill_gap(client, topic: str) -> Fragment:
+    resp = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "Jesteś spokojnym nauczycielem medytacji. Język: polski."},
+            {"role": "user", "content": (
+                f"Napisz jeden krótki fragment prowadzonej medytacji (60–90 słów) na temat: {topic}. "
+                "Bez wstępu i zakończenia. Pauzy zapisuj jako [PAUZA N], gdzie N to sekundy."
+            )},
+        ],
+        temperature=0.7,
+    )
+    text = resp.choices[0].message.content.strip()
+    if len(text) > MAX_GENERATED_CHARS:
+        # ucinamy na końcu ostatniego pełnego zdania w limicie
+        cut = text[:MAX_GENERATED_CHARS]
+        end = max(cut.rfind(ch) for ch in ".!?…")
+        text = cut[:end + 1] if end > 0 else cut
+    return Fragment(
+        id=_generated_id(topic, text), kind="core", text=text,
+        topics=(topic.strip(),), seconds=estimate_seconds(text),
+    )
+
+
+def _refine(client, text: str) -> str:
+    resp = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "Jesteś spokojnym nauczycielem medytacji. Język: polski."},
+            {"role": "user", "content": (
+                "Wygładź przejścia między akapitami tej prowadzonej medytacji. Nie skracaj jej, "
+                "nie zmieniaj treści ani znaczników [PAUZA N].\n\n" + text
+            )},
+        ],
+        temperature=0.3,
+    )
+    return resp.choices[0].message.content.strip()
+
+
+# ---------------- SKŁADANIE ----------------
+def _filler(lib: Dict[str, List[Fragment]], rng: random.Random):
+    """Body scan po kolei przeplatany oddechem, potem oddech + ogólne fragmenty w kółko."""
+    breath = lib["breath"][1:] or lib["breath"]
+    for i, frag in enumerate(lib["body"]):
+        yield frag
+        if i % 2 == 1:
+            yield rng.choice(breath)
+    loop = breath + [f for f in lib["core"] if "*" in f.topics]
+    while True:
+        rng.shuffle(loop)
+        yield from loop
+
+
+def compose(topic: str, minutes: int, client=None, refine: bool = False, seed=None) -> Composition:
+    """Składa medytację ~`minutes` minut; bez klienta nie wykonuje żadnych zapytań."""
+    lib = library()
+    rng = random.Random(seed if seed is not None else f"{_norm(topic)}|{minutes}")
+    target = minutes * 60
+    llm_calls = 0
+
+    core = core_for(topic)
+    if not core and client is not None and topic.strip():
+        core = [_save_generated(_fill_gap(client, topic))]
+        llm_calls += 1
+    if not core:
+        core = [f for f in lib["core"] if "*" in f.topics][:1]
+
+    parts = [rng.choice(lib["intro"]), lib["breath"][0], *core]
+    closing = rng.choice(lib["closing"])
+    total = sum(f.seconds for f in parts) + closing.seconds
+
+    fill = _filler(lib, rng)
+    while total < target:
+        frag = next(fill)
+        parts.append(frag)
+        total += frag.seconds
+    parts.append(closing)
+
+    text = "\n\n".join(f.text for f in parts)
+    if refine and client is not None:
+        return Composition(_refine(client, text), [], total, llm_calls + 1)
+    return Composition(text, parts, total, llm_calls)
@@ -0,0 +1,86 @@
+# dag.py — mały harmonogram zadań z zależnościami
+#
+# Każdy węzeł startuje w puli wątków, gdy tylko skończą się jego zależności,
+# więc niezależne gałęzie (np. obraz i tekst) biegną równolegle, a czas
+# całości to mniej więcej najdłuższa ścieżka, nie suma etapów.
+#
+# Funkcje węzłów NIE mogą wołać st.* (wątki nie mają kontekstu Streamlit) —
+# zwracają wyniki, a UI rysuje je po run_dag().
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+@dataclass
+class Node:
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]     # dostaje {nazwa_zależności: wynik}
+    deps: Sequence[str] = ()
+
+
+@dataclass
+class DagResult:
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+    timings: Dict[str, Tuple[float, float]] = field(default_factory=dict)  # (start, koniec) od startu DAG
+    wall: float = 0.0
+
+    @property
+    def stage_sum(self) -> float:
+        """Ile trwałoby wszystko po kolei."""
+        return sum(end - start for start, end in self.timings.values())
+
+
+def run_dag(nodes: List[Node], max_workers: int | None = None) -> DagResult:
+    by_name = {n.name: n for n in nodes}
+    for n in nodes:
+        missing = [d for d in n.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"Węzeł {n.name!r} zależy od nieznanych: {missing}")
+
+    out = DagResult()
+    pending = {n.name for n in nodes}
+    running = {}
+    t0 = time.perf_counter()
+
+    def call(node: Node):
+        start = time.perf_counter() - t0
+        try:
+            return node.fn({d: out.results[d] for d in node.deps})
+        finally:
+            out.timings[node.name] = (start, time.perf_counter() - t0)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(nodes) or 1, thread_name_prefix="dag") as pool:
+        while pending or running:
+            # powtarzamy, aż skan niczego nie zmieni — błąd schodzi w dół łańcucha z -> b -> a
+            changed = True
+            while changed:
+                changed = False
+                for name in sorted(pending):
+                    node = by_name[name]
+                    failed = [d for d in node.deps if d in out.errors]
+                    if failed:
+                        out.errors[name] = RuntimeError(f"pominięte — nie powiodło się: {', '.join(failed)}")
+                        pending.discard(name)
+                        changed = True
+                    elif all(d in out.results for d in node.deps):
+                        running[pool.submit(call, node)] = name
+                        pending.discard(name)
+                        changed = True
+
+            if not running:
+                if pending:  # cykl — nic nie może ruszyć
+                    raise ValueError(f"Cykl w zależnościach: {sorted(pending)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                try:
+                    out.results[name] = fut.result()
+                except Exception as e:
+                    out.errors[name] = e
+
+    out.wall = time.perf_counter() - t0
+    return out
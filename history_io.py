@@ -0,0 +1,157 @@
+# history_io.py — eksport i import historii dni
+#
+# Wszystko idzie strumieniowo, dzień po dniu (generatory):
+#   eksport: kolumny dni z data["days"] -> dekodowanie pojedynczo -> CSV / NDJSON w paczkach
+#            (st.download_button i tak trzyma cały plik w pamięci serwera — wynik
+#            to bajty, ale historia nie jest dekodowana w całości naraz)
+#   import:  plik -> wiersz po wierszu -> storage.put_days() paczkami -> jeden save_data()
+import csv
+import datetime as dt
+import io
+import json
+from typing import IO, Iterable, Iterator, Tuple
+
+from storage import decode_day, iter_rows, migrate, put_days, save_data
+
+CHUNK_DAYS = 500
+BASE_COLUMNS = ["date", "water_ml", "notes", "bonus"]
+
+
+# ---------------- EKSPORT ----------------
+def iter_days(data: dict) -> Iterator[Tuple[str, dict]]:
+    """(data, dzień) w kolejności dat; dekodujemy tylko bieżący dzień."""
+    for date, row in iter_rows(data):
+        yield date, decode_day(data, row)
+
+
+def iter_csv(data: dict, chunk_days: int = CHUNK_DAYS) -> Iterator[str]:
+    tasks = list(data["tasks"])
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(BASE_COLUMNS + tasks)
+    n = 0
+    for date, day in iter_days(data):
+        done = day["done"]
+        writer.writerow(
+            [date, day["water_ml"], day["notes"], day["bonus"]]
+            + [int(done.get(t, False)) for t in tasks]
+        )
+        n += 1
+        if n % chunk_days == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def iter_ndjson(data: dict, chunk_days: int = CHUNK_DAYS) -> Iterator[str]:
+    lines = []
+    for date, day in iter_days(data):
+        done = [name for name, ok in day["done"].items() if ok]
+        lines.append(json.dumps(
+            {"date": date, "done": done, "water_ml": day["water_ml"], "notes": day["notes"], "bonus": day["bonus"]},
+            ensure_ascii=False,
+        ))
+        if len(lines) == chunk_days:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def export_bytes(chunks: Iterable[str]) -> bytes:
+    """Skleja paczki w gotowy plik dla st.download_button (media manager Streamlit i tak trzyma bajty)."""
+    return "".join(chunks).encode("utf-8")
+
+
+# ---------------- IMPORT ----------------
+# Parsery zwracają (data, dzień) albo None dla uszkodzonego wiersza —
+# wyjątek w generatorze zakończyłby go, a my chcemy jechać dalej.
+_BAD_ROW = (ValueError, KeyError, TypeError, AttributeError, IndexError)
+
+
+def _day(date: str, done, water_ml, notes, bonus) -> Tuple[str, dict]:
+    # fromisoformat w 3.11 przyjmuje też "20240105" czy "2024-W02-1" — klucz zawsze YYYY-MM-DD
+    date = dt.date.fromisoformat(date).isoformat()  # ValueError dla złej daty
+    if isinstance(done, list):
+        done = {name: True for name in done}
+    return date, {
+        "done": {name: bool(ok) for name, ok in done.items()},
+        "water_ml": int(water_ml or 0),
+        "notes": notes or "",
+        "bonus": bonus or "",
+    }
+
+
+def iter_import_csv(f: IO[str]) -> Iterator[Tuple[str, dict] | None]:
+    for row in csv.DictReader(f):
+        try:
+            done = {k: v.strip() in ("1", "true", "True") for k, v in row.items() if k not in BASE_COLUMNS and k and v}
+            yield _day(row["date"], done, row.get("water_ml"), row.get("notes"), row.get("bonus"))
+        except _BAD_ROW:
+            yield None
+
+
+def iter_import_ndjson(f: IO[str]) -> Iterator[Tuple[str, dict] | None]:
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+            yield _day(rec["date"], rec.get("done") or {}, rec.get("water_ml"), rec.get("notes"), rec.get("bonus"))
+        except _BAD_ROW:
+            yield None
+
+
+def iter_import_legacy_json(f: IO[str]) -> Iterator[Tuple[str, dict] | None]:
+    """Cały health_data.json (v1 lub v2) — jeden dokument JSON, więc wczytywany w całości."""
+    try:
+        raw = json.load(f)
+        if raw.get("v", 1) == 1:
+            # v1: dzień po dniu, bez migrate() — jeden zły dzień nie psuje całego pliku
+            other, rows = None, sorted(raw["days"].items())
+        else:
+            other = migrate(raw)
+            rows = iter_rows(other)
+    except _BAD_ROW:
+        yield None
+        return
+    # dekodowanie też w try: bonus spoza rejestru czy ucięty wiersz to jeden pominięty dzień
+    for date, row in rows:
+        try:
+            day = row if other is None else decode_day(other, row)
+            yield _day(date, day.get("done") or {}, day.get("water_ml"), day.get("notes"), day.get("bonus"))
+        except _BAD_ROW:
+            yield None
+
+
+def import_days(data: dict, rows: Iterable[Tuple[str, dict] | None], batch_size: int = CHUNK_DAYS) -> Tuple[int, int]:
+    """Wstawia dni paczkami przez storage; zwraca (zaimportowane, pominięte)."""
+    imported = skipped = 0
+    batch = []
+    for row in rows:
+        if row is None:
+            skipped += 1
+            continue
+        batch.append(row)
+        if len(batch) == batch_size:
+            imported += put_days(data, batch)
+            batch = []
+    if batch:
+        imported += put_days(data, batch)
+    if imported:
+        save_data(data)
+    return imported, skipped
+
+
+def open_upload(uploaded) -> Iterator[Tuple[str, dict]]:
+    """Plik ze st.file_uploader -> generator dni (format po rozszerzeniu)."""
+    text = io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline="")
+    name = uploaded.name.lower()
+    if name.endswith(".csv"):
+        return iter_import_csv(text)
+    if name.endswith(".json"):
+        return iter_import_legacy_json(text)
+    return iter_import_ndjson(text)
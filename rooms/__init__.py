@@ -0,0 +1,78 @@
+# rooms/ — rejestr pokoi
+#
+# Każdy pełny pokój to osobny moduł z funkcją render(data). Moduł jest
+# importowany dopiero przy pierwszej wizycie (potem siedzi w sys.modules),
+# więc start aplikacji nie parsuje kodu ani zależności innych pokoi.
+# Pokoje-placeholdery nie mają modułu — wystarczą im metadane z rejestru.
+#
+# Nowy pokój = jeden wpis w ROOMS (+ ewentualnie plik rooms/<nazwa>.py).
+import importlib
+import importlib.util
+from dataclasses import dataclass
+from typing import Tuple
+
+import streamlit as st
+
+from ui import greet_user
+
+
+@dataclass(frozen=True)
+class Room:
+    key: str
+    label: str
+    emoji: str
+    module: str | None = None           # "rooms.health"; None = placeholder
+    requires: Tuple[str, ...] = ()      # moduły, które muszą być zainstalowane
+    greeting: str = "Hej"               # placeholder: powitanie
+    info: str = ""                      # placeholder: opis
+
+    @property
+    def choice(self) -> str:
+        return f"{self.emoji} {self.label}"
+
+
+ROOMS = {
+    r.key: r
+    for r in [
+        Room("start", "Start", "✨", module="rooms.start"),
+        Room("health", "Motywator zdrowia", "🚵", module="rooms.health", requires=("pydantic",)),
+        Room("mind", "Mind", "🧘", module="rooms.mind", requires=("openai", "httpx", "requests", "pydub")),
+        Room("sport", "Sport", "🏋️", greeting="Hejka",
+             info="Tu pojawi się pokój sportu (np. cardio, siła, mobilność)."),
+        Room("dieta", "Dieta", "🍎", greeting="Cześć",
+             info="Tu pojawi się pokój diety (np. zdrowe posiłki, woda, brak alkoholu)."),
+        Room("study", "Nauka", "📚", greeting="Hej",
+             info="Tu pojawi się pokój nauki (np. pomodoro, fiszki, notatki)."),
+        Room("finance", "Finanse", "💸", greeting="Dzień dobry",
+             info="Tu pojawi się pokój finansów (np. budżet, oszczędności, brak zbędnych wydatków)."),
+        Room("social", "Social", "🤝", greeting="Witaj",
+             info="Tu pojawi się pokój relacji (np. networking, kontakt z przyjaciółmi)."),
+        Room("order", "Porządek", "🧹", greeting="Hejka",
+             info="Tu pojawi się pokój porządku (np. sprzątanie, minimalizm)."),
+    ]
+}
+
+# Mapka ładnych nazw pokoi (do toastów)
+ROOM_LABEL = {key: room.label for key, room in ROOMS.items()}
+
+
+def missing_requirements(room: Room) -> list:
+    return [name for name in room.requires if importlib.util.find_spec(name) is None]
+
+
+def render(key: str, data: dict) -> None:
+    room = ROOMS.get(key) or ROOMS["start"]
+
+    if room.module is None:
+        st.title(f"{room.emoji} {room.label} (Wkrótce...)")
+        greet_user(room.greeting)
+        st.info(room.info)
+        return
+
+    missing = missing_requirements(room)
+    if missing:
+        st.title(f"{room.emoji} {room.label}")
+        st.error(f"Ten pokój wymaga pakietów: {', '.join(missing)}. Doinstaluj je z requirements.txt.")
+        return
+
+    importlib.import_module(room.module).render(data)
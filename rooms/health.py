@@ -0,0 +1,312 @@
+# rooms/health.py — 🚵 Motywator zdrowia (Bike Quest)
+import datetime as dt
+import hashlib
+import json
+import os
+import random
+from typing import List
+
+import streamlit as st
+from pydantic import BaseModel
+
+from storage import day_count, get_day, put_day, save_data, set_fields
+from ui import greet_user
+
+
+# ---------------- MODELE ----------------
+class Task(BaseModel):
+    name: str
+    category: str
+    hint: str
+
+LIGHT_TASKS: List[Task] = [
+    Task(name="Medytacja 10–15 min", category="Mind 🧘‍♂️", hint="Krótka sesja oddechowa lub body-scan."),
+    Task(name="Rower stacjonarny 20–30 min", category="Body 🚴‍♂️", hint="Utrzymaj lekkie tętno, bez zajezdni."),
+    Task(name="Sen 7–8 h", category="Regeneracja 😴", hint="Zasłoń ekran min. 1 h przed snem."),
+]
+
+EXTRA_TASKS: List[Task] = [
+    Task(name="2L wody", category="Hydro 💧", hint="Butelka 1L x2 i po sprawie."),
+    Task(name="Spacer 20–30 min", category="Body 🚶‍♂️", hint="Świeże powietrze > scroll."),
+    Task(name="1 posiłek warzywno-owocowy", category="Dieta 🍎", hint="Sałatka/owocowy bowl > fastfood."),
+    Task(name="Rozciąganie 5–10 min", category="Mobilność 🧘", hint="Szyja, plecy, biodra."),
+    Task(name="Dziennik wdzięczności (2–3 zdania)", category="Mind 📓", hint="Co dziś było dobre?"),
+    Task(name="Bez telefonu 1 h przed snem", category="Higiena snu 🌙", hint="Papierowa książka wygrywa."),
+    Task(name="30 dni bez alkoholu", category="Nawyk 🧱", hint="Liczymy streak dzień po dniu."),
+]
+
+BONUS_POOL = [
+    "30 przysiadów w ciągu dnia",
+    "10 min rozciągania pleców",
+    "Zamień słodki napój na wodę",
+    "3-min medytacja wdzięczności",
+    "Wejdź po schodach zamiast windy",
+]
+
+POWERUPS = {5: "💧", 10: "🍎", 15: "🛌", 20: "📓", 25: "🧘", 30: "👑"}  # co 5 pól + meta
+
+
+def render(data: dict):
+    st.title("🚵 Motywator zdrowia — Bike Quest")
+    greet_user("Hej")
+
+    # ---------------- STAN DNIA ----------------
+    today = dt.date.today().isoformat()
+    st.caption(f"Dzień: {today}")
+
+    mode = st.toggle("Hard mode (wszystkie cele)", value=False, help="Wyłączone = Light (3 filary). Włączone = pełny zestaw.")
+    tasks = LIGHT_TASKS + (EXTRA_TASKS if mode else [])
+
+    day_state = get_day(data, today) or {
+        "done": {t.name: False for t in tasks},
+        "water_ml": 0,
+        "notes": "",
+        "bonus": random.choice(BONUS_POOL),
+    }
+    for t in tasks:
+        day_state["done"].setdefault(t.name, False)
+    put_day(data, today, day_state)
+    save_data(data)
+
+    # ---------------- WYZWANIE 30 DNI ----------------
+        
+    start_date_str = data["challenge"].get("start_date")
+
+        # === NOWY BLOK: UFO – 1 ciekawostka dziennie z animacją ===
+
+
+    st.header("🛸 UFO – dzisiejsza ciekawostka")
+
+    def load_facts():
+        fp = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ciekawostki.json")
+        with open(fp, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    FACTS = load_facts()
+    kategorie = list(FACTS.keys())
+
+    def daily_index(seed: str, n: int) -> int:
+        h = hashlib.sha256(seed.encode("utf-8")).hexdigest()
+        return int(h, 16) % n
+
+    def ufo_flight(duration_sec: float = 2.2):
+        # Płynny przelot z lekkim bujaniem (1 przebieg)
+        st.markdown(f"""
+        <div class="ufo-wrap"><span class="ufo">🛸</span></div>
+        <style>
+        .ufo-wrap {{
+            position: relative; height: 32px; overflow: hidden;
+            margin: .25rem 0 .5rem 0;
+        }}
+        .ufo {{
+            position: absolute; left: -40px; top: 2px;
+            font-size: 22px;
+            animation: fly {duration_sec}s linear 1,
+                    wobble {duration_sec/6:.2f}s ease-in-out infinite alternate;
+        }}
+        @keyframes fly {{
+            0%   {{ left: -40px;   transform: translateY(0) rotate(0deg); }}
+            50%  {{                 transform: translateY(-6px) rotate(3deg); }}
+            100% {{ left: calc(100% + 40px); transform: translateY(0) rotate(0deg); }}
+        }}
+        @keyframes wobble {{
+            from {{ filter: drop-shadow(0 0 0 rgba(255,255,255,.0)); }}
+            to   {{ filter: drop-shadow(0 0 6px rgba(255,255,255,.6)); }}
+        }}
+        </style>
+        """, unsafe_allow_html=True)
+
+
+    # ta sama ciekawostka dla wszystkich w danej kategorii przez cały dzień
+    today = dt.date.today().isoformat()
+    kat = st.selectbox("🎲 Kategoria", kategorie, index=0)
+    daily_key = f"ufo_fact_{kat}_{today}"
+
+    if daily_key in st.session_state:
+        st.success(f"💡 Dzisiejsza ciekawostka ({kat}):\n\n{st.session_state[daily_key]}")
+        st.caption("🔒 Zablokowane do północy. Nowa ciekawostka jutro.")
+    else:
+        speed = st.slider("⏱️ Czas przelotu UFO", 1.2, 4.0, 2.2, 0.1)
+
+        if st.button("🪨 Rzuć kamieniem w UFO!"):
+            ufo_flight(speed)
+            idx = daily_index(seed=f"{kat}|{today}", n=len(FACTS[kat]))
+            fact = FACTS[kat][idx]
+            st.session_state[daily_key] = fact
+            st.balloons()
+            st.success(f"🎯 Trafione!\n\n💡 {fact}")
+        else:
+            st.info("Kliknij, żeby odkryć dzisiejszą ciekawostkę.")
+
+    # === KONIEC BLOKU UFO ===
+
+    cols = st.columns([2,1,1])
+    with cols[0]:
+        start_date = st.date_input(
+            "Ustaw datę startu wyzwania",
+            value=dt.date.fromisoformat(start_date_str) if start_date_str else dt.date.today()
+        )
+    with cols[1]:
+        if st.button("Start od dziś"):
+            set_fields(data, "challenge", start_date=dt.date.today().isoformat())
+            save_data(data); st.rerun()
+    with cols[2]:
+        if st.button("Wyczyść start"):
+            set_fields(data, "challenge", start_date=None)
+            save_data(data); st.rerun()
+
+    if start_date_str != (start_date.isoformat() if start_date else None):
+        set_fields(data, "challenge", start_date=start_date.isoformat() if start_date else None)
+        save_data(data)
+
+    start_date_str = data["challenge"].get("start_date")
+    if start_date_str:
+        start_dt = dt.date.fromisoformat(start_date_str)
+        days_passed = (dt.date.today() - start_dt).days + 1
+        days_passed = max(1, min(days_passed, 30))
+        days_left = 30 - days_passed
+        pct = days_passed / 30
+        m1, m2, m3 = st.columns(3)
+        with m1: st.metric("Dni minęły", days_passed)
+        with m2: st.metric("Zostało", days_left)
+        with m3: st.metric("Start", start_dt.strftime("%Y-%m-%d"))
+        st.progress(pct, text=f"Postęp: {days_passed}/30 dni")
+        if days_passed >= 30:
+            st.success("🏆 30 dni zaliczone! Chcesz nowy cel albo ciągnąć serię dalej?")
+    else:
+        days_passed = 0
+        st.info("Ustaw datę startu — od niej liczymy 30 dni i odliczamy postęp.")
+
+    st.divider()
+
+    # ---------------- PODSUMOWANIE CELÓW DNIA ----------------
+    c1, c2 = st.columns(2)
+    with c1: st.subheader("🎯 Cele na dziś")
+    completed = sum(day_state["done"].get(t.name, False) for t in tasks)
+    with c2:
+        st.metric("Postęp", f"{completed}/{len(tasks)}", help="Dzisiejsze checklisty")
+
+    def on_check_change(name):
+        day_state["done"][name] = st.session_state[f"cb_{name}"]
+        put_day(data, today, day_state)
+        save_data(data)
+
+    for t in tasks:
+        st.checkbox(
+            f"**{t.name}** — _{t.category}_",
+            value=day_state["done"].get(t.name, False),
+            key=f"cb_{t.name}",
+            help=t.hint,
+            on_change=on_check_change,
+            args=(t.name,),
+        )
+
+    st.divider()
+
+    # ---------------- LICZNIK WODY ----------------
+    st.subheader("💧 Licznik wody (cel 2000 ml)")
+    w1, w2, w3 = st.columns([1,2,1])
+
+    def adjust_water(delta):
+        day_state["water_ml"] = max(0, day_state["water_ml"] + delta)
+        put_day(data, today, day_state)
+        save_data(data)
+
+    with w1:
+        if st.button("-250 ml"): adjust_water(-250)
+    with w2:
+        st.progress(min(day_state["water_ml"]/2000, 1.0))
+        st.write(f"Wypite: **{day_state['water_ml']} ml / 2000 ml**")
+    with w3:
+        if st.button("+250 ml"): adjust_water(+250)
+
+    st.info(f"🎲 Bonus dnia: **{day_state['bonus']}** (opcjonalnie)")
+
+    st.divider()
+
+    # ---------------- NOTATKI ----------------
+    st.subheader("📝 Notatki na dziś")
+    notes_val = st.text_area(
+        "Co warto zapamiętać (myśli, spostrzeżenia, wdzięczność)?",
+        value=day_state.get("notes", ""), height=140,
+        placeholder="Np. „Dziś najtrudniejsza była ochota na słodkie po obiedzie…”"
+    )
+    if st.button("Zapisz notatki"):
+        day_state["notes"] = notes_val
+        put_day(data, today, day_state)
+        save_data(data)
+        st.success("Zapisano notatki.")
+
+    # ---------------- MOTYWACJA ----------------
+    def motivation(completed, total, days_passed, start_set):
+        if not start_set:
+            return "Każda zmiana zaczyna się od decyzji. Ustaw datę startu i zrób dziś pierwszy krok."
+        if days_passed in (1, 2, 3):
+            return "Pierwsze dni nadają rytm. Prosto, spokojnie, konsekwentnie."
+        if days_passed in (5, 10, 15, 20, 25):
+            return f"Checkpoint {days_passed}! Zabierasz ze sobą power-up i jedziesz dalej 🚵"
+        if completed == total and total > 0:
+            return "Pięknie! Dziś komplet. Korona rośnie w oczach — jutro powtórka 👑"
+        if completed >= max(1, total//2):
+            return "Ponad połowa za Tobą. Jeszcze chwila i dzień na zielono!"
+        return "Nie musisz robić wszystkiego naraz. Jedna rzecz teraz — rozruch to 80% sukcesu."
+
+    st.success("💬 " + motivation(completed, len(tasks), days_passed, bool(start_date_str)))
+
+    st.divider()
+
+    # ---------------- MINI-GRA: BIKE QUEST 6×5 ----------------
+    st.subheader("🎮 Bike Quest: 30-dniowa trasa 🚵 → 🏰")
+    st.caption("Każdy dzień streaka przesuwa Cię o jedno pole. Co 5 pól — power-up!")
+
+    def draw_rpg_board(days_passed: int) -> str:
+        total, rows, cols = 30, 5, 6  # 5 wierszy × 6 kol. = 30
+        tiles = []
+        for r in range(rows):
+            row = []
+            for c in range(cols):
+                i = r * cols + c + 1
+                if i == total:
+                    row.append("🏰")        # meta
+                elif i == days_passed and i < total:
+                    row.append("🚵")        # gracz
+                elif i in POWERUPS and i > days_passed:
+                    row.append(POWERUPS[i]) # power-up widoczny na trasie
+                elif i < days_passed:
+                    row.append("🟩")        # przebyte pola (zielone)
+                else:
+                    row.append("▫️")        # puste pole
+            tiles.append("".join(row))
+        return "\n".join(tiles)
+
+    # narysuj planszę
+    if start_date_str:
+        st.text(draw_rpg_board(days_passed))
+    else:
+        st.info("Ustaw datę startu wyzwania, aby wyruszyć w trasę 🚵")
+
+    # legenda
+    st.caption("Legenda: 🚵 Ty | 🟩 przebyte | ▫️ do przejechania | 💧🍎🛌📓🧘 power-upy | 🏰 meta | 👑 nagroda")
+
+    # ---------------- EKSPORT / IMPORT HISTORII ----------------
+    with st.expander("📦 Eksport / import historii"):
+        from history_io import export_bytes, import_days, iter_csv, iter_ndjson, open_upload
+
+        st.caption(f"Zapisanych dni: {day_count(data)}")
+        fmt = st.radio("Format", ["CSV", "NDJSON"], horizontal=True)
+        if st.button("Przygotuj plik do pobrania"):
+            if fmt == "CSV":
+                st.download_button("💾 Pobierz CSV", export_bytes(iter_csv(data)), "questapp_historia.csv", mime="text/csv")
+            else:
+                st.download_button("💾 Pobierz NDJSON", export_bytes(iter_ndjson(data)), "questapp_historia.ndjson",
+                                   mime="application/x-ndjson")
+
+        uploaded_hist = st.file_uploader(
+            "Import: CSV, NDJSON (jeden dzień w linii) albo stary health_data.json",
+            type=["csv", "ndjson", "jsonl", "json"],
+        )
+        if uploaded_hist and st.button("📥 Importuj"):
+            imported, skipped = import_days(data, open_upload(uploaded_hist))
+            st.success(f"Zaimportowano dni: {imported}" + (f" (pominięte błędne wiersze: {skipped})" if skipped else ""))
+            if imported:
+                st.rerun()
@@ -0,0 +1,480 @@
+# rooms/mind.py — 🧘 Mind Room (medytacja z AI, głos TTS, wizualizacja DALL·E)
+import datetime as _dt
+import os
+import time
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from shutil import which
+
+import httpx
+import requests
+import streamlit as st
+from openai import OpenAI
+from pydub import AudioSegment
+
+from audio import chunk_with_pauses, concat_mp3, render_segments
+from blobstore import fetch, keep
+from dag import Node, run_dag
+from tts_backends import ENV_VAR, CachedBackend, get_backend
+from tts_text import normalize_for_tts, split_pauses, split_sentences
+from ui import greet_user
+
+SYSTEM_PROMPT = "Jesteś spokojnym nauczycielem medytacji. Język: polski."
+
+# Kandydaci: PATH + Linux (Cloud) + Windows
+CANDIDATE_FFMPEG = [
+    "ffmpeg",
+    "ffmpeg.exe",
+    "/usr/bin/ffmpeg",  # Streamlit Cloud
+    r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
+    r"C:\Program Files (x86)\ffmpeg\bin\ffmpeg.exe",
+    r"C:\ffmpeg\bin\ffmpeg.exe",
+    r"C:\ProgramData\chocolatey\bin\ffmpeg.exe",
+]
+CANDIDATE_FFPROBE = [
+    "ffprobe",
+    "ffprobe.exe",
+    "/usr/bin/ffprobe",
+    r"C:\Program Files\ffmpeg\bin\ffprobe.exe",
+    r"C:\Program Files (x86)\ffmpeg\bin\ffprobe.exe",
+    r"C:\ffmpeg\bin\ffprobe.exe",
+    r"C:\ProgramData\chocolatey\bin\ffprobe.exe",
+]
+
+
+@lru_cache(maxsize=1)
+def shared_http_client() -> httpx.Client:
+    """Jedna pula połączeń dla wszystkich sesji — klucz API idzie w nagłówku każdego zapytania, nie w niej."""
+    return httpx.Client(trust_env=False)  # ignoruje HTTP(S)_PROXY na Cloud
+
+
+def dalle_prompt(topic: str) -> str:
+    """Buduje prompt do wizualizacji medytacyjnej (możesz używać w różnych pokojach)."""
+    topic = topic.strip() or "spokojny las o świcie"
+    return (
+        f"Ethereal, calming visualization of '{topic}' for guided meditation. "
+        f"Soft light, dreamy, cinematic composition, watercolor + soft gradients, "
+        f"high detail, no text, no watermark."
+    )
+
+
+# ---------------- ETAPY (bez st.*, więc można je puszczać w wątkach) ----------------
+def generate_text(client, topic: str, minutes: int) -> str:
+    resp = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"Napisz prowadzoną medytację (~{minutes} minut) po polsku. Temat: {topic}. Dodaj pauzy i wskazówki oddechu."}
+        ],
+        temperature=0.7,
+    )
+    return resp.choices[0].message.content.strip()
+
+
+def generate_image(client, topic: str, size: str) -> bytes:
+    resp = client.images.generate(
+        model="dall-e-2",   # DALL·E 2
+        prompt=dalle_prompt(topic),
+        size=size,
+        n=1,
+    )
+    # pobieramy bajty obrazu z URL
+    return requests.get(resp.data[0].url, timeout=30).content
+
+
+def setup_ffmpeg() -> str | None:
+    """Szuka ffmpeg/ffprobe i ustawia je w pydub; zwraca ścieżkę ffmpeg albo None."""
+    ffmpeg_path = next((p for p in map(_resolve, CANDIDATE_FFMPEG) if p), None)
+    ffprobe_path = next((p for p in map(_resolve, CANDIDATE_FFPROBE) if p), None)
+    if not ffmpeg_path:
+        return None
+
+    # wołane przy każdym rerunie — dopisujemy katalog tylko raz na proces
+    ffmpeg_dir = os.path.dirname(ffmpeg_path)
+    path_dirs = os.environ.get("PATH", "").split(os.pathsep)
+    if ffmpeg_dir not in path_dirs:
+        os.environ["PATH"] = os.pathsep.join([ffmpeg_dir] + path_dirs)
+
+    # Pydub: wskażemy binarki wprost
+    AudioSegment.converter = ffmpeg_path
+    AudioSegment.ffmpeg = ffmpeg_path
+    AudioSegment.ffprobe = ffprobe_path
+    return ffmpeg_path
+
+
+def _resolve(candidate: str) -> str | None:
+    path = which(candidate) if not os.path.isabs(candidate) else candidate
+    return path if path and os.path.exists(path) else None
+
+
+def audio_chunks(text: str, fragments: list, progressive: bool) -> tuple[list, list, bool]:
+    """Kawałki do syntezy, cisza po każdym (ms, z [PAUZA N]) i czy warto użyć cache audio."""
+    # czyścimy tekst z markdown/emoji zanim poleci do TTS; pauzy z liczbą stają się ciszą
+    if progressive and fragments:
+        # kawałki w granicach fragmentów — powtarzające się fragmenty biorą audio z cache
+        chunks, pauses_ms = [], []
+        for frag in fragments:
+            c, p = chunk_with_pauses([(split_sentences(t), s) for t, s in split_pauses(frag)])
+            chunks += c
+            pauses_ms += p
+        return chunks, pauses_ms, True
+    if progressive:
+        return (*chunk_with_pauses([(split_sentences(t), s) for t, s in split_pauses(text)]), False)
+    # bez progresji: jeden kawałek na odcinek między pauzami
+    pieces = [([normalize_for_tts(t)] if normalize_for_tts(t).strip() else [], s) for t, s in split_pauses(text)]
+    return (*chunk_with_pauses(pieces, len(text) + 1, len(text) + 1), False)
+
+
+def render_audio(chunks, tts, bg_path, bg_gain_db, v_gain_db, fade_in_ms, fade_out_ms, pauses_ms=None,
+                 on_segment=None):
+    """Renderuje fragmenty i skleja je w jeden MP3; zwraca (ścieżka, czas do 1. fragmentu)."""
+    t0 = time.perf_counter()
+    # znacznik czasu dla ludzi + losowy sufiks: sesje renderują równolegle i w tej
+    # samej sekundzie nie mogą nadpisać (ani skasować w concat_mp3) cudzych fragmentów
+    ts = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    bg = AudioSegment.from_file(bg_path).apply_gain(bg_gain_db) if bg_path else None
+
+    os.makedirs(os.path.join("meditations", "segments"), exist_ok=True)
+    parts, ttfa = [], None
+    for seg in render_segments(
+        chunks, tts, os.path.join("meditations", "segments"), f"mind_seg_{ts}",
+        bg=bg, v_gain_db=v_gain_db, fade_in_ms=fade_in_ms, fade_out_ms=fade_out_ms, pauses_ms=pauses_ms,
+    ):
+        parts.append(seg.path)
+        if ttfa is None:
+            ttfa = time.perf_counter() - t0
+        if on_segment is not None:
+            on_segment(seg, ttfa)
+
+    final_path = os.path.join("meditations", f"mind_final_{ts}.mp3")
+    return concat_mp3(parts, final_path), ttfa
+
+
+def render(data: dict):
+    st.title("🧘 Mind Room — Guided Meditation")
+    greet_user("Witaj")
+
+
+    # --- Klucz API ---
+    st.markdown("🔑 Podaj swój klucz OpenAI, aby wygenerować medytację:")
+    openai_key = st.text_input("OpenAI API Key", type="password")
+
+    client = None
+    if not openai_key:
+        st.info("➡️ Wklej klucz, żeby odblokować generowanie (tryb biblioteki działa bez klucza).")
+    else:
+        # klient (i klucz) żyje tylko w tej sesji; ciężka pula połączeń HTTP jest wspólna
+        if st.session_state.get("openai_key") != openai_key:
+            st.session_state["openai_key"] = openai_key
+            st.session_state["openai_client"] = OpenAI(api_key=openai_key, http_client=shared_http_client())
+        client = st.session_state["openai_client"]
+
+    st.markdown("Witaj w pokoju Mind! Tutaj możesz wygenerować swoją spersonalizowaną medytację ✨")
+
+    # --- Ustawienia ---
+    topics = [
+        "Poranna wdzięczność",
+        "Medytacja na sen",
+        "Skupienie i klarowność",
+        "Redukcja stresu",
+        "Body scan",
+        "Akceptacja siebie",
+        "Mindfulness w ruchu",
+        "Świadomy oddech",
+        "Cisza i bezruch",
+        "Bycie tu i teraz",
+    ]
+    selected_topic = st.selectbox("🎯 Wybierz temat medytacji:", [""] + topics)
+    user_prompt = st.text_input("📝 Albo wpisz własny temat:", value=selected_topic)
+    med_length = st.selectbox("⏱️ Długość medytacji (min):", [5, 10, 15, 20])
+
+    # pamięć sesji
+    if "mind_text" not in st.session_state:
+        st.session_state["mind_text"] = ""
+    if "mind_audio_path" not in st.session_state:
+        st.session_state["mind_audio_path"] = ""
+    if "mind_image" not in st.session_state:
+        st.session_state["mind_image"] = None
+    if "mind_from_library" not in st.session_state:
+        st.session_state["mind_from_library"] = False  # tekst = fragmenty z biblioteki połączone "\n\n"
+
+    gen_mode = st.radio(
+        "📖 Źródło tekstu",
+        ["🤖 AI (gpt-4o-mini)", "📚 Biblioteka fragmentów (offline)"],
+        horizontal=True,
+    )
+    from_library = gen_mode.startswith("📚")
+    refine = False
+    if from_library:
+        refine = st.checkbox(
+            "✨ Dopracuj przejścia przez AI", value=False, disabled=client is None,
+            help="Bez klucza medytacja jest składana w całości lokalnie, bez żadnych zapytań.",
+        )
+
+    def make_text():
+        """Tekst wg wybranego źródła -> (tekst, fragmenty, opis)."""
+        if from_library:
+            from composer import compose
+
+            comp = compose(user_prompt, med_length, client=client, refine=refine)
+            note = (f"złożona z {len(comp.fragments) or 'wygładzonych'} fragmentów "
+                    f"(~{comp.seconds // 60} min, zapytania AI: {comp.llm_calls})")
+            return comp.text, [f.text for f in comp.fragments], note
+        return generate_text(client, user_prompt, med_length), [], "wygenerowana"
+
+    # --- Ustawienia audio (potrzebne też w trybie "wszystko naraz") ---
+    with st.expander("🎧 Ustawienia audio", expanded=bool(st.session_state["mind_text"])):
+        ffmpeg_path = setup_ffmpeg()
+        st.caption(f"FFmpeg path detected: {ffmpeg_path or 'NONE'}")
+
+        tts = None
+        try:
+            tts = get_backend()
+            if not tts.available():
+                st.error(f"Silnik TTS '{tts.name}' jest niedostępny w tym środowisku (ustaw {ENV_VAR}).")
+                tts = None
+        except ValueError as e:
+            st.error(f"❌ {e}")
+        if tts is not None:
+            st.caption(f"🗣️ Silnik głosu: {tts.label}" + (" · offline" if tts.offline else ""))
+
+        if not ffmpeg_path:
+            st.error("Nie znaleziono FFmpeg. Lokalnie doinstaluj lub na Cloud dodaj packages.txt z 'ffmpeg'.")
+
+        os.makedirs("meditations", exist_ok=True)
+        os.makedirs("assets/sounds", exist_ok=True)
+
+        uploaded_bg = st.file_uploader("Dodaj pliki MP3 z odgłosami natury", type=["mp3"], accept_multiple_files=True)
+        if uploaded_bg:
+            for up in uploaded_bg:
+                with open(os.path.join("assets", "sounds", up.name), "wb") as f:
+                    f.write(up.read())
+            st.success("✅ Dodano pliki do `assets/sounds/`")
+
+        available_bg = [f for f in os.listdir("assets/sounds") if f.endswith(".mp3")]
+        col_bg1, col_bg2 = st.columns([2,1])
+        with col_bg1:
+            bg_choice = st.selectbox("🎵 Wybierz tło", ["(brak)"] + sorted(available_bg))
+        with col_bg2:
+            bg_gain_db = st.slider("Głośność tła (dB)", -30, 6, -10)
+
+        v_gain_db = st.slider("🎙️ Głośność głosu (dB)", -6, 12, 4)
+        fade_in_ms = st.slider("Fade in (ms)", 0, 8000, 1500, 250)
+        fade_out_ms = st.slider("Fade out (ms)", 0, 8000, 2000, 250)
+
+        progressive = st.toggle(
+            "⚡ Tryb progresywny (pierwszy fragment gra od razu)", value=True,
+            help="Medytacja jest renderowana zdanie po zdaniu; pełny plik powstaje ze sklejenia fragmentów.",
+        )
+
+    audio_ready = bool(ffmpeg_path) and tts is not None
+    bg_path = os.path.join("assets/sounds", bg_choice) if bg_choice != "(brak)" else None
+
+    col_i1, col_i2 = st.columns(2)
+    with col_i1:
+        img_size = st.selectbox("🖼️ Rozmiar", ["256x256", "512x512", "1024x1024"], index=2)
+    with col_i2:
+        st.caption("DALL·E 2 obsługuje tylko powyższe rozmiary")
+
+    # przyciski
+    col1, col2 = st.columns([2,1])
+    with col1:
+        gen_text_clicked = st.button("🧘 Wygeneruj medytację (tekst)", use_container_width=True)
+    with col2:
+        gen_all_clicked = st.button("🚀 Wszystko naraz", use_container_width=True,
+                                    help="Tekst, głos i obraz jednym kliknięciem — obraz rusza od razu, głos zaraz po tekście.")
+
+    # --- 1) Tekst ---
+    if gen_text_clicked:
+        if not from_library and not openai_key:
+            st.error("Podaj OpenAI API Key.")
+            st.stop()
+        if not from_library and not user_prompt:
+            st.error("Podaj temat medytacji.")
+            st.stop()
+
+        try:
+            with st.spinner("Generuję medytację tekstową..."):
+                t0 = time.perf_counter()
+                text, fragments, note = make_text()
+            keep(st.session_state, "mind_text", text)
+            st.session_state["mind_from_library"] = bool(fragments)
+            st.success(f"✅ Medytacja {note}! ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+        except Exception as e:
+            st.error(f"❌ Błąd generowania tekstu: {e}")
+
+    # --- 0) Wszystko naraz: tekst ‖ obraz, potem głos ---
+    if gen_all_clicked:
+        if not from_library and not (openai_key and user_prompt):
+            st.error("Podaj OpenAI API Key i temat medytacji (albo wybierz bibliotekę fragmentów).")
+            st.stop()
+
+        # wartości z widgetów zbieramy tu — wątki DAG nie mają dostępu do st.*
+        nodes = [Node("text", lambda _: make_text())]
+        if client is not None:
+            nodes.append(Node("image", lambda _: generate_image(client, user_prompt, img_size)))
+        if audio_ready:
+            def audio_node(inputs):
+                text, fragments, _ = inputs["text"]
+                chunks, pauses_ms, use_cache = audio_chunks(text, fragments, progressive)
+                engine = CachedBackend(tts) if use_cache else tts
+                return render_audio(chunks, engine, bg_path, bg_gain_db, v_gain_db, fade_in_ms, fade_out_ms,
+                                    pauses_ms=pauses_ms)
+            nodes.append(Node("audio", audio_node, deps=["text"]))
+
+        with st.spinner("Generuję tekst, głos i obraz równolegle…"):
+            res = run_dag(nodes)
+
+        if "text" in res.results:
+            text, fragments, note = res.results["text"]
+            keep(st.session_state, "mind_text", text)
+            st.session_state["mind_from_library"] = bool(fragments)
+        if "audio" in res.results:
+            st.session_state["mind_audio_path"], st.session_state["mind_ttfa"] = res.results["audio"]
+        if "image" in res.results:
+            keep(st.session_state, "mind_image", res.results["image"])
+
+        for name, err in res.errors.items():
+            st.error(f"❌ {name}: {err}")
+        m1, m2, m3 = st.columns(3)
+        with m1: st.metric("Czas całości", f"{res.wall:.1f} s")
+        with m2: st.metric("Suma etapów", f"{res.stage_sum:.1f} s")
+        with m3: st.metric("Zysk", f"{res.stage_sum - res.wall:.1f} s")
+        st.caption(" · ".join(f"{name}: {start:.1f}–{end:.1f} s" for name, (start, end) in res.timings.items()))
+        if "image" in res.results:
+            st.image(res.results["image"], caption="Twoja wizualizacja ✨", use_container_width=True)
+        elif client is None:
+            st.caption("🖼️ Obraz pominięty — do DALL·E potrzebny jest klucz OpenAI.")
+
+    mind_text = fetch(st.session_state, "mind_text", "")
+    mind_fragments = mind_text.split("\n\n") if st.session_state["mind_from_library"] else []
+
+    if mind_text:
+        st.text_area("📜 Podgląd medytacji:", mind_text, height=300)
+
+        # --- 2) AUDIO: TTS (backend wg QUESTAPP_TTS_BACKEND) + miks z tłem ---
+
+        st.markdown("### 🎧 Audio – wygeneruj głos i dodaj tło natury")
+
+        if audio_ready and st.button("🎙️ Wygeneruj głos i miks"):
+            try:
+                t_click = time.perf_counter()
+                chunks, pauses_ms, use_cache = audio_chunks(
+                    mind_text, mind_fragments, progressive
+                )
+                engine = CachedBackend(tts) if use_cache else tts
+                if bg_path:
+                    st.caption(f"Loaded background: {bg_choice}, gain {bg_gain_db} dB")
+
+                first_slot = st.empty()
+                progress = st.progress(0.0, text="Renderuję pierwszy fragment…")
+
+                def show_segment(seg, ttfa):
+                    if seg.index == 0:
+                        with first_slot.container():
+                            st.metric("⏱️ Czas do pierwszego dźwięku", f"{ttfa:.1f} s")
+                            st.audio(seg.path)
+                    progress.progress((seg.index + 1) / seg.total, text=f"Fragment {seg.index + 1}/{seg.total}")
+
+                final_path, st.session_state["mind_ttfa"] = render_audio(
+                    chunks, engine, bg_path, bg_gain_db, v_gain_db, fade_in_ms, fade_out_ms,
+                    pauses_ms=pauses_ms, on_segment=show_segment,
+                )
+
+                st.session_state["mind_audio_path"] = final_path
+                st.success(f"🎧 Audio gotowe! ({time.perf_counter() - t_click:.1f} s)")
+                if use_cache:
+                    st.caption(f"♻️ Fragmenty audio z cache: {engine.hits}/{engine.hits + engine.misses}")
+            except Exception as e:
+                st.error(f"❌ Błąd audio: {e}")
+        elif not audio_ready:
+            st.warning("Audio niedostępne — sprawdź FFmpeg i silnik TTS w „Ustawieniach audio”.")
+
+    # --- Podgląd i pobieranie (osobny blok, niżej) ---
+        if st.session_state["mind_audio_path"]:
+            st.audio(st.session_state["mind_audio_path"])
+            with open(st.session_state["mind_audio_path"], "rb") as f:
+                st.download_button("💾 Pobierz MP3", f, "mind_meditation.mp3")
+
+
+
+    # # --- 3) Wizualizacja ---
+    # col_i1, col_i2 = st.columns(2)
+    # with col_i1:
+    #     img_size = st.selectbox("🖼️ Rozmiar", ["1024x1024", "1792x1024", "1024x1792"], index=0)
+    # with col_i2:
+    #     quality = st.selectbox("Jakość", ["standard", "hd"], index=0)
+
+    # gen_img_clicked = st.button("🌌 Generuj wizualizację (DALL·E 3)")
+
+    # if gen_img_clicked:
+    #     if not openai_key:
+    #         st.error("Podaj OpenAI API Key.")
+    #         st.stop()
+    #     try:
+    #         client = OpenAI(api_key=openai_key)
+    #         prompt_text = dalle_prompt(user_prompt)
+
+    #         #quality_api = {"standard": "medium", "hd": "high"}[quality]
+
+    #         with st.spinner("Generuję obraz…"):
+    #             resp = client.images.generate(
+    #                 model="image-alpha-001", #"gpt-image-1"(DALL-E 3)
+    #                 prompt=prompt_text,
+    #                 size=img_size,
+    #                 #quality=quality_api,
+    #                 n=1,
+    #             )
+
+    #         # pobieramy URL obrazu
+    #         img_url = resp.data[0].url  
+
+    #         # pokazujemy w Streamlit
+    #         st.image(img_url, caption="Twoja wizualizacja ✨", use_container_width=True)
+
+    #         # przycisk pobierania
+    #         img_bytes = requests.get(img_url).content
+    #         st.download_button(
+    #             "💾 Pobierz PNG",
+    #             data=img_bytes,
+    #             file_name="mind_visualization.png",
+    #             mime="image/png",
+    #         )
+
+    #         # zapis do session_state
+    #         st.session_state["mind_image"] = img_bytes
+    #         st.success("🖼️ Wizualizacja gotowa!")
+
+    #     except Exception as e:
+    #         st.error(f"❌ Błąd generowania obrazu: {e}")
+
+    # --- 3) Wizualizacja ---
+
+    gen_img_clicked = st.button("🌌 Generuj wizualizację (DALL·E 2)")
+
+    if gen_img_clicked:
+        if not openai_key:
+            st.error("Podaj OpenAI API Key.")
+            st.stop()
+        try:
+            with st.spinner("Generuję obraz…"):
+                img_bytes = generate_image(client, user_prompt, img_size)
+
+            # pokazujemy w Streamlit
+            st.image(img_bytes, caption="Twoja wizualizacja ✨", use_container_width=True)
+
+            # przycisk pobierania
+            st.download_button(
+                "💾 Pobierz PNG",
+                data=img_bytes,
+                file_name=f"mind_visualization_{_dt.datetime.now().strftime('%Y%m%d_%H%M%S')}.png",
+                mime="image/png",
+            )
+
+            # zapis do session_state (duże bajty -> magazyn na dysku, w sesji uchwyt)
+            keep(st.session_state, "mind_image", img_bytes)
+            st.success("🖼️ Wizualizacja gotowa!")
+
+        except Exception as e:
+            st.error(f"❌ Błąd generowania obrazu: {e}")
@@ -0,0 +1,35 @@
+# rooms/start.py — ekran startowy: imię + wybór pokoju
+import streamlit as st
+
+from storage import save_data, set_fields
+
+
+def render(data: dict):
+    from rooms import ROOMS
+
+    st.markdown("<h1>✨ QuestApp ✨</h1>", unsafe_allow_html=True)
+    st.markdown("### 👋 Cześć! Witaj w Twojej podróży questów")
+
+    name = st.text_input("Jak masz na imię?", value=data["user"]["name"], placeholder="np. Rafał")
+
+    room_keys = [key for key in ROOMS if key != "start"]
+    quest_key = st.selectbox(
+        "Co chcesz poprawić?",
+        room_keys,
+        index=0,
+        format_func=lambda key: ROOMS[key].choice,
+    )
+
+    if st.button("Wejdź do pokoju"):
+        # 1) Zapis do pliku
+        set_fields(data, "user", name=name.strip(), goals=[ROOMS[quest_key].choice])
+        save_data(data)
+
+        # 2) Sync do session_state
+        st.session_state["user_name"] = data["user"]["name"]
+
+        # 3) Routing
+        st.session_state["room"] = quest_key
+
+        # 4) Rerun na końcu
+        st.rerun()
@@ -0,0 +1,458 @@
+# storage.py — zapis/odczyt health_data.json
+#
+# Format v2 (kompaktowy, kolumnowy):
+# {
+#   "v": 2,
+#   "tasks": ["Medytacja 10–15 min", ...],           # rejestr zadań: indeks = stałe ID (bit)
+#   "bonuses": ["30 przysiadów w ciągu dnia", ...],  # rejestr bonusów: indeks = ID
+#   "days": {                                        # równoległe kolumny, posortowane po dacie
+#     "dates": ["2025-09-13", ...],
+#     "mask":  [5, ...],          # zrobione zadania jako bity
+#     "water": [1500, ...],       # ml
+#     "bonus": [2, ...],          # ID bonusu, -1 = brak
+#     "notes": {"2025-09-13": "...", ...}   # tylko dni z notatką
+#   },
+#   "challenge": {...},
+#   "user": {...}
+# }
+# Kolumny zamiast listy na dzień: json.loads tworzy kilka list zamiast tysięcy
+# małych obiektów; puste notatki (prawie wszystkie) w ogóle nie trafiają do pliku. W pamięci zostają w tej samej postaci — dzień szukamy
+# bisectem po posortowanych datach, dekodujemy tylko ten, którego potrzeba.
+# Format v1 (stary) trzymał w każdym dniu pełne nazwy zadań -> bool i był
+# zapisywany z indent=2. Przy odczycie v1 jest automatycznie migrowany do v2.
+import atexit
+import bisect
+import json
+import operator
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Tuple
+
+DATA_FILE = Path("health_data.json")
+SCHEMA_VERSION = 2
+
+# Kolejność = ID zadania (numer bitu w masce). Tylko dopisujemy na końcu,
+# nigdy nie zmieniamy kolejności ani nie usuwamy — inaczej stare maski się rozjadą.
+TASK_REGISTRY = [
+    # LIGHT_TASKS
+    "Medytacja 10–15 min",
+    "Rower stacjonarny 20–30 min",
+    "Sen 7–8 h",
+    # EXTRA_TASKS
+    "2L wody",
+    "Spacer 20–30 min",
+    "1 posiłek warzywno-owocowy",
+    "Rozciąganie 5–10 min",
+    "Dziennik wdzięczności (2–3 zdania)",
+    "Bez telefonu 1 h przed snem",
+    "30 dni bez alkoholu",
+]
+
+# Jak wyżej, tylko dla bonusu dnia (BONUS_POOL z rooms/health.py) — tylko dopisujemy.
+BONUS_REGISTRY = [
+    "30 przysiadów w ciągu dnia",
+    "10 min rozciągania pleców",
+    "Zamień słodki napój na wodę",
+    "3-min medytacja wdzięczności",
+    "Wejdź po schodach zamiast windy",
+]
+
+# Jeden słownik danych jest wspólny dla wszystkich sesji (CACHE niżej), więc
+# każda zmiana (put_day, rejestry, pola user/challenge) i migawka do zapisu
+# idą pod tą samą blokadą. RLock — put_days woła put_day, a ten rejestry.
+DATA_LOCK = threading.RLock()
+
+# kolumny dnia (poza "dates" i rzadkim "notes")
+DAY_COLUMNS = ("mask", "water", "bonus")
+
+
+def empty_data() -> dict:
+    return {
+        "v": SCHEMA_VERSION,
+        "tasks": list(TASK_REGISTRY),
+        "bonuses": list(BONUS_REGISTRY),
+        "days": {"dates": [], **{col: [] for col in DAY_COLUMNS}, "notes": {}},
+        "challenge": {"start_date": None},
+        "user": {},
+    }
+
+
+# ---------------- REJESTRY ----------------
+def _intern(registry: list, value: str) -> int:
+    try:
+        return registry.index(value)
+    except ValueError:
+        registry.append(value)
+        return len(registry) - 1
+
+
+def task_id(data: dict, name: str) -> int:
+    """Zwraca stałe ID zadania; nieznane zadanie dopisuje na koniec rejestru."""
+    with DATA_LOCK:
+        return _intern(data["tasks"], name)
+
+
+def bonus_id(data: dict, bonus: str) -> int:
+    """ID bonusu w rejestrze (nieznany jest dopisywany); pusty bonus -> -1."""
+    if not bonus:
+        return -1
+    with DATA_LOCK:
+        return _intern(data["bonuses"], bonus)
+
+
+# ---------------- KODOWANIE DNIA ----------------
+def encode_day(data: dict, day_state: dict) -> tuple:
+    """dict dnia (done: {nazwa: bool}, water_ml, notes, bonus) -> (mask, water, notes, bonus_id)."""
+    mask = 0
+    for name, done in (day_state.get("done") or {}).items():
+        if done:
+            mask |= 1 << task_id(data, name)
+    return (
+        mask,
+        int(day_state.get("water_ml") or 0),
+        day_state.get("notes") or "",
+        bonus_id(data, day_state.get("bonus") or ""),
+    )
+
+
+def decode_day(data: dict, row: tuple) -> dict:
+    """(mask, water, notes, bonus_id) -> dict dnia, w takim kształcie jakiego używa UI."""
+    mask, water, notes, bonus = row
+    return {
+        "done": {name: bool(mask >> i & 1) for i, name in enumerate(data["tasks"])},
+        "water_ml": water,
+        "notes": notes,
+        "bonus": data["bonuses"][bonus] if bonus >= 0 else "",
+    }
+
+
+# ---------------- DNI (KOLUMNY) ----------------
+def _find(days: dict, date: str) -> Tuple[int, bool]:
+    """Indeks daty w posortowanej kolumnie "dates" (albo miejsce wstawienia) + czy jest."""
+    dates = days["dates"]
+    i = bisect.bisect_left(dates, date)
+    return i, i < len(dates) and dates[i] == date
+
+
+def day_count(data: dict) -> int:
+    return len(data["days"]["dates"])
+
+
+def iter_rows(data: dict) -> Iterator[Tuple[str, tuple]]:
+    """(data, zakodowany dzień) w kolejności dat — z migawki kolumn, więc put_day w trakcie nie przeszkadza."""
+    with DATA_LOCK:
+        days = data["days"]
+        dates, masks, waters, bonuses = (list(days[col]) for col in ("dates", *DAY_COLUMNS))
+        notes = dict(days["notes"])
+    for date, mask, water, bonus in zip(dates, masks, waters, bonuses):
+        yield date, (mask, water, notes.get(date, ""), bonus)
+
+
+def get_day(data: dict, date: str) -> dict | None:
+    """Dekoduje tylko jeden dzień — reszta historii zostaje w postaci zwartej."""
+    with DATA_LOCK:
+        days = data["days"]
+        i, found = _find(days, date)
+        if not found:
+            return None
+        return decode_day(data, (days["mask"][i], days["water"][i], days["notes"].get(date, ""), days["bonus"][i]))
+
+
+def _store(data: dict, date: str, row: tuple) -> None:
+    mask, water, notes, bonus = row
+    days = data["days"]
+    if notes:
+        days["notes"][date] = notes
+    else:
+        days["notes"].pop(date, None)
+    i, found = _find(days, date)
+    if found:
+        days["mask"][i], days["water"][i], days["bonus"][i] = mask, water, bonus
+        return
+    # zwykle dzisiejszy dzień -> insert na końcu list
+    days["dates"].insert(i, date)
+    for col, value in zip(DAY_COLUMNS, (mask, water, bonus)):
+        days[col].insert(i, value)
+
+
+def put_day(data: dict, date: str, day_state: dict) -> None:
+    with DATA_LOCK:
+        _store(data, date, encode_day(data, day_state))
+
+
+def put_days(data: dict, items) -> int:
+    """Wstawia paczkę (date, day_state) naraz; zapis pliku zostaje dla wołającego."""
+    items = list(items)  # parsowanie pliku poza blokadą
+    with DATA_LOCK:
+        for date, day_state in items:
+            _store(data, date, encode_day(data, day_state))
+    return len(items)
+
+
+def set_fields(data: dict, section: str, **fields) -> None:
+    """data[section].update(fields) pod DATA_LOCK — np. set_fields(data, "challenge", start_date=None)."""
+    with DATA_LOCK:
+        data.setdefault(section, {}).update(fields)
+
+
+def _check_days(days: dict) -> None:
+    """ValueError, jeśli kolumny nie są równej długości albo daty nie są posortowane."""
+    dates = days["dates"]
+    if any(len(days[col]) != len(dates) for col in DAY_COLUMNS) or not isinstance(days["notes"], dict):
+        raise ValueError("Kolumny dni mają różne długości")
+    if not all(map(operator.lt, dates, islice(dates, 1, None))):
+        raise ValueError("Daty dni nie są posortowane albo się powtarzają")
+
+
+# ---------------- MIGRACJA ----------------
+def migrate(raw: dict) -> dict:
+    """Podnosi dowolną starszą wersję pliku do SCHEMA_VERSION."""
+    version = raw.get("v", 1)
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Nieobsługiwana wersja pliku danych: {version}")
+
+    if version == 1:
+        data = empty_data()
+        data["challenge"] = raw.get("challenge") or {"start_date": None}
+        data["user"] = raw.get("user") or {}
+        for date, day_state in sorted((raw.get("days") or {}).items()):
+            put_day(data, date, day_state)
+        return data
+
+    _check_days(raw["days"])
+    return raw
+
+
+# ---------------- PLIK ----------------
+def dumps(data: dict) -> str:
+    # bez wcięć i spacji — plik to głównie historia dni
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def read_file(path: Path) -> dict:
+    """
+    Czyta i migruje plik danych.
+
+    Plik z nowszej wersji aplikacji -> ValueError (nie nadpisujemy go pustym stanem).
+    Plik uszkodzony (zły JSON, migracja się wywraca) jest odkładany jako
+    *.<czas>.bak i zaczynamy od pustych danych — nic nie ginie przy pierwszym save_data().
+    """
+    if not path.exists():
+        return empty_data()
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        raw = None
+    if isinstance(raw, dict) and isinstance(raw.get("v"), int) and raw["v"] > SCHEMA_VERSION:
+        return migrate(raw)  # rzuca ValueError
+    try:
+        return migrate(raw)
+    except Exception:
+        os.replace(path, backup_path(path))
+        return empty_data()
+
+
+def backup_path(path: Path) -> Path:
+    """Unikalna nazwa kopii — kolejny uszkodzony plik nie nadpisze poprzedniego .bak."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return path.with_name(f"{path.name}.{stamp}.bak")
+
+
+def write_file(path: Path, text: str) -> None:
+    """Zapis odporny na crash: plik tymczasowy + fsync + os.replace."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# ---------------- CACHE + WRITE-BEHIND ----------------
+class _Entry:
+    __slots__ = ("data", "mtime", "version", "dirty_since", "retry_at")
+
+    def __init__(self, data: dict, mtime: int | None):
+        self.data = data
+        self.mtime = mtime          # mtime pliku, z którego/do którego ostatnio synchronizowaliśmy
+        self.version = 0            # rośnie przy każdym put()
+        self.dirty_since = None     # time.monotonic() pierwszego niezapisanego put()
+        self.retry_at = 0.0         # po nieudanym zapisie: nie próbuj ponownie przed tą chwilą
+
+
+class StateCache:
+    """
+    Wspólny dla procesu cache stanów (jeden wpis = jeden plik danych).
+
+    - odczyt z pamięci; plik czytany ponownie tylko gdy zmienił się jego mtime
+      (ktoś zapisał go z zewnątrz), a my nie mamy niezapisanych zmian,
+    - zapis trafia do pamięci, a wątek w tle utrwala go po `flush_delay` s;
+      pod `_lock` robimy tylko migawkę (dumps), write + fsync idą poza nim,
+      żeby load_data() innych sesji nie czekało na dysk,
+    - najdawniej używane czyste wpisy wypadają po przekroczeniu `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 64, flush_delay: float = 0.5, lock=None):
+        self.max_entries = max_entries
+        self.flush_delay = flush_delay
+        self._entries: "OrderedDict[Path, _Entry]" = OrderedDict()
+        self._lock = lock or threading.RLock()  # ta sama blokada co zmiany danych -> spójna migawka
+        self._wake = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()  # jeden zapis na raz; zawsze brany PRZED _lock
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.last_flush_lag = 0.0
+        self.max_flush_lag = 0.0
+
+    # --- odczyt ---
+    def get(self, path: Path) -> dict:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and (entry.dirty_since is not None or entry.mtime == _mtime(path)):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry.data
+
+            self.misses += 1
+            data = read_file(path)
+            if entry is None:
+                entry = self._entries[path] = _Entry(data, _mtime(path))
+                self._evict()
+            else:
+                entry.data, entry.mtime = data, _mtime(path)
+                self._entries.move_to_end(path)
+            return data
+
+    # --- zapis ---
+    def put(self, path: Path, data: dict) -> None:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                entry = self._entries[path] = _Entry(data, _mtime(path))
+                self._evict()
+            entry.data = data
+            entry.version += 1
+            if entry.dirty_since is None:
+                entry.dirty_since = time.monotonic()
+            self._entries.move_to_end(path)
+            self._ensure_thread()
+            self._wake.notify()
+
+    def flush(self, path: Path | None = None) -> None:
+        """Zapisuje od razu (jeden plik albo wszystkie niezapisane)."""
+        with self._lock:
+            paths = [path] if path is not None else list(self._entries)
+            dirty = [(p, self._entries[p]) for p in paths if p in self._entries]
+        for p, entry in dirty:
+            self._flush_entry(p, entry)
+
+    def _flush_entry(self, path: Path, entry: _Entry) -> bool:
+        """Migawka pod _lock, zapis na dysk poza nim. Nie wołać z trzymanym _lock (ani DATA_LOCK)."""
+        with self._io_lock:
+            with self._lock:
+                if entry.dirty_since is None:
+                    return True
+                version, dirty_since = entry.version, entry.dirty_since
+                # zmiany danych idą pod tą samą blokadą (DATA_LOCK), więc migawka jest spójna
+                text = dumps(entry.data)
+
+            write_file(path, text)
+            mtime = _mtime(path)
+
+            with self._lock:
+                entry.mtime = mtime
+                lag = time.monotonic() - dirty_since
+                self.last_flush_lag = lag
+                self.max_flush_lag = max(self.max_flush_lag, lag)
+                self.flushes += 1
+                if entry.version == version:
+                    entry.dirty_since = None
+                    entry.retry_at = 0.0
+        return True
+
+    def _evict(self) -> None:
+        # niezapisane wpisy zostają, dopóki wątek w tle ich nie utrwali
+        excess = len(self._entries) - self.max_entries
+        for path in list(self._entries)[:-1]:  # ostatni = właśnie użyty
+            if excess <= 0:
+                break
+            if self._entries[path].dirty_since is None:
+                del self._entries[path]
+                excess -= 1
+
+    # --- wątek w tle ---
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="questapp-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                due, next_due = [], None
+                for path, entry in self._entries.items():
+                    if entry.dirty_since is None:
+                        continue
+                    at = max(entry.dirty_since + self.flush_delay, entry.retry_at)
+                    if at <= now:
+                        due.append((path, entry))
+                    else:
+                        next_due = at if next_due is None else min(next_due, at)
+                if not due:
+                    self._wake.wait(None if next_due is None else next_due - now)
+                    continue
+
+            for path, entry in due:
+                try:
+                    ok = self._flush_entry(path, entry)
+                except OSError:
+                    ok = False  # np. pełny dysk
+                if not ok:
+                    with self._lock:
+                        entry.retry_at = time.monotonic() + self.flush_delay  # spróbujemy później
+
+    # --- metryki ---
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            now = time.monotonic()
+            dirty = [e.dirty_since for e in self._entries.values() if e.dirty_since is not None]
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "pending": len(dirty),
+                "pending_age_ms": (now - min(dirty)) * 1000 if dirty else 0.0,
+                "flushes": self.flushes,
+                "last_flush_lag_ms": self.last_flush_lag * 1000,
+                "max_flush_lag_ms": self.max_flush_lag * 1000,
+            }
+
+
+# jeden cache na proces — moduł jest importowany raz, a app.py wykonuje się przy każdym rerunie
+CACHE = StateCache(lock=DATA_LOCK)
+atexit.register(CACHE.flush)
+
+
+def load_data(path: Path = DATA_FILE) -> dict:
+    return CACHE.get(path)
+
+
+def save_data(data: dict, path: Path = DATA_FILE) -> None:
+    CACHE.put(path, data)
@@ -0,0 +1,15 @@
+# tests/conftest.py — moduły aplikacji leżą w katalogu głównym repo
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Pusty katalog roboczy: health_data.json, meditations/ itp. nie lądują w repo."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
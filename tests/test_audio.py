@@ -0,0 +1,14 @@
+from audio import chunk_sentences, chunk_with_pauses
+
+
+def test_first_chunk_is_short():
+    sentences = ["Zdanie numer %d." % i for i in range(20)]
+    chunks = chunk_sentences(sentences, first_chars=40, max_chars=120)
+    assert len(chunks[0]) <= 40 and all(len(c) <= 120 for c in chunks)
+    assert " ".join(chunks) == " ".join(sentences)
+
+
+def test_chunks_end_at_pauses():
+    chunks, pauses = chunk_with_pauses([(["Wdech."], 5), ([], 3), (["Wydech.", "Koniec."], 0)])
+    assert chunks == ["Wdech.", "Wydech. Koniec."]
+    assert pauses == [8000, 0]
@@ -0,0 +1,53 @@
+import gc
+
+import pytest
+
+import blobstore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = blobstore.BlobStore(root=tmp_path / "blobs")
+    monkeypatch.setattr(blobstore, "STORE", store)
+    monkeypatch.setattr(blobstore, "INLINE", blobstore.InlineBudget(limit=3000))
+    return store
+
+
+def test_small_values_stay_inline_large_spill(store):
+    state = {}
+    blobstore.keep(state, "small", "a" * 100)
+    blobstore.keep(state, "big", b"x" * (blobstore.SPILL_BYTES + 1))
+    assert state["small"] == "a" * 100
+    assert isinstance(state["big"], blobstore.BlobRef)
+    assert blobstore.fetch(state, "big") == b"x" * (blobstore.SPILL_BYTES + 1)
+    assert blobstore.inline_bytes(state) == 100
+
+
+def test_process_inline_budget_forces_spill(store):
+    a, b = {}, {}
+    blobstore.keep(a, "text", "a" * 2000)
+    blobstore.keep(b, "text", "b" * 2000)          # 4000 > 3000 na proces
+    assert a["text"] == "a" * 2000
+    assert isinstance(b["text"], blobstore.BlobRef)
+    assert blobstore.fetch(b, "text") == "b" * 2000
+    assert blobstore.INLINE.used == 2000
+
+
+def test_overwrite_and_dead_session_return_budget(store):
+    a = {}
+    blobstore.keep(a, "text", "a" * 2000)
+    blobstore.keep(a, "text", "a" * 500)
+    assert blobstore.INLINE.used == 500
+    del a
+    gc.collect()
+    assert blobstore.INLINE.used == 0
+
+
+def test_overwritten_blob_is_removed(store):
+    state = {}
+    big = "z" * (blobstore.SPILL_BYTES + 1)
+    blobstore.keep(state, "text", big)
+    path = store._path(state["text"].digest)
+    assert path.exists()
+    blobstore.keep(state, "text", "krótki")
+    assert not path.exists() and state["text"] == "krótki"
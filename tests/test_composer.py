@@ -0,0 +1,85 @@
+import json
+import threading
+import types
+
+import pytest
+
+import composer
+
+
+@pytest.fixture(autouse=True)
+def fresh_library(workdir, monkeypatch):
+    # GENERATED_FILE jest względny — w workdir zaczynamy bez wygenerowanych fragmentów
+    monkeypatch.setattr(composer, "_library", None)
+
+
+class FakeClient:
+    """Udaje client.chat.completions.create; zlicza wywołania."""
+
+    def __init__(self, text="Oddychaj spokojnie. [PAUZA 5] Poczuj, jak ciało mięknie."):
+        self.text = text
+        self.calls = 0
+        self.chat = types.SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        msg = types.SimpleNamespace(content=self.text)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)])
+
+
+def test_compose_without_client_is_offline_and_deterministic():
+    a = composer.compose("Redukcja stresu", 5)
+    b = composer.compose("Redukcja stresu", 5)
+    assert a.text == b.text and a.llm_calls == 0
+    assert a.seconds >= 5 * 60
+    assert a.fragments[0].kind == "intro" and a.fragments[-1].kind == "closing"
+    assert any(f.id.startswith("stres-") for f in a.fragments)
+
+
+def test_unknown_topic_without_client_uses_general_core():
+    comp = composer.compose("Temat spoza biblioteki", 3)
+    assert comp.llm_calls == 0
+    assert any("*" in f.topics for f in comp.fragments if f.kind == "core")
+
+
+def test_missing_core_is_generated_once():
+    client = FakeClient()
+    first = composer.compose("Wdzięczność za kawę", 3, client=client)
+    second = composer.compose("wdzięczność  za KAWĘ", 3, client=client)
+    assert (first.llm_calls, second.llm_calls, client.calls) == (1, 0, 1)
+
+    saved = json.loads(composer.GENERATED_FILE.read_text(encoding="utf-8"))["core"]
+    assert [r["id"] for r in saved] == [composer._generated_id("Wdzięczność za kawę", client.text)]
+    assert saved[0]["id"].startswith("gen-") and saved[0]["id"] != "gen-1"
+
+
+def test_generated_fragments_are_capped(monkeypatch):
+    monkeypatch.setattr(composer, "MAX_GENERATED", 2)
+    for i in range(4):
+        composer.compose(f"Temat {i}", 1, client=FakeClient(f"Fragment numer {i}."))
+    saved = json.loads(composer.GENERATED_FILE.read_text(encoding="utf-8"))["core"]
+    assert [r["topics"] for r in saved] == [["Temat 2"], ["Temat 3"]]
+    assert [f.topics for f in composer.library()["core"] if f.id.startswith("gen-")] == [("Temat 2",), ("Temat 3",)]
+    assert not composer.GENERATED_FILE.with_name(composer.GENERATED_FILE.name + ".tmp").exists()
+
+
+def test_long_generated_text_is_cut_at_sentence_end(monkeypatch):
+    monkeypatch.setattr(composer, "MAX_GENERATED_CHARS", 50)
+    frag = composer._fill_gap(FakeClient("Pierwsze zdanie jest tutaj. " * 5), "Długi temat")
+    assert frag.text == "Pierwsze zdanie jest tutaj."
+
+
+def test_concurrent_saves_keep_one_fragment_per_topic():
+    barrier = threading.Barrier(8)
+
+    def worker(i):
+        barrier.wait()
+        composer.compose("Wspólny temat", 1, client=FakeClient(f"Wersja {i}."))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    saved = json.loads(composer.GENERATED_FILE.read_text(encoding="utf-8"))["core"]
+    assert len(saved) == 1 and len(composer.core_for("Wspólny temat")) == 1
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from dag import Node, run_dag
+
+
+def _fail(_):
+    raise RuntimeError("boom")
+
+
+def test_independent_branches_run_in_parallel():
+    nodes = [
+        Node("a", lambda _: time.sleep(0.2) or 1),
+        Node("b", lambda _: time.sleep(0.2) or 2),
+        Node("sum", lambda x: x["a"] + x["b"], deps=["a", "b"]),
+    ]
+    res = run_dag(nodes)
+    assert res.results["sum"] == 3
+    assert not res.errors
+    assert res.wall < res.stage_sum
+
+
+def test_failure_propagates_down_a_chain():
+    # nazwy celowo tak, że skan alfabetyczny trafia na "a" przed "b"
+    nodes = [
+        Node("z", _fail),
+        Node("b", lambda x: x["z"], deps=["z"]),
+        Node("a", lambda x: x["b"], deps=["b"]),
+        Node("ok", lambda _: "fine"),
+    ]
+    res = run_dag(nodes)
+    assert str(res.errors["z"]) == "boom"
+    assert "z" in str(res.errors["b"])
+    assert "b" in str(res.errors["a"])
+    assert res.results == {"ok": "fine"}
+
+
+def test_cycle_is_reported():
+    nodes = [Node("a", lambda x: 1, deps=["b"]), Node("b", lambda x: 1, deps=["a"])]
+    with pytest.raises(ValueError, match="Cykl"):
+        run_dag(nodes)
+
+
+def test_unknown_dependency():
+    with pytest.raises(ValueError, match="nieznanych"):
+        run_dag([Node("a", lambda x: 1, deps=["missing"])])
@@ -0,0 +1,81 @@
+import io
+import json
+
+import pytest
+
+import history_io
+import storage
+
+
+@pytest.fixture
+def data(monkeypatch):
+    # import_days kończy się save_data() — zapis w tle do CACHE nie jest tu potrzebny
+    monkeypatch.setattr(history_io, "save_data", lambda data: None)
+    data = storage.empty_data()
+    storage.put_day(data, "2024-01-01", {"done": {"Sen 7–8 h": True}, "water_ml": 750, "notes": "", "bonus": ""})
+    storage.put_day(data, "2024-01-02", {"done": {"Nowe, z przecinkiem": True}, "water_ml": 0,
+                                         "notes": "linia 1\nlinia 2", "bonus": "Własny bonus"})
+    return data
+
+
+def _days(data):
+    return list(history_io.iter_days(data))
+
+
+@pytest.mark.parametrize("export, parse", [
+    (history_io.iter_csv, history_io.iter_import_csv),
+    (history_io.iter_ndjson, history_io.iter_import_ndjson),
+])
+def test_export_import_round_trip(data, export, parse):
+    payload = history_io.export_bytes(export(data, chunk_days=1)).decode("utf-8")
+    other = storage.empty_data()
+    assert history_io.import_days(other, parse(io.StringIO(payload, newline="")), batch_size=1) == (2, 0)
+    assert _days(other) == _days(data)
+
+
+def test_legacy_json_round_trip(data):
+    other = storage.empty_data()
+    rows = history_io.iter_import_legacy_json(io.StringIO(storage.dumps(data)))
+    assert history_io.import_days(other, rows) == (2, 0)
+    assert _days(other) == _days(data)
+
+
+def test_bad_rows_are_skipped(data):
+    lines = [
+        json.dumps({"date": "2024-02-01", "water_ml": 100}),
+        json.dumps({"date": "2024-02-30"}),          # zła data
+        json.dumps({"water_ml": 1}),                  # brak daty
+        json.dumps({"date": "2024-02-02", "water_ml": "dużo"}),
+        '{"date": "2024-02-03", "wat',                # ucięty wiersz
+        "",
+    ]
+    imported, skipped = history_io.import_days(data, history_io.iter_import_ndjson(io.StringIO("\n".join(lines))))
+    assert (imported, skipped) == (1, 4)
+    assert storage.get_day(data, "2024-02-01")["water_ml"] == 100
+
+
+def test_legacy_json_skips_undecodable_days(data):
+    doc = json.loads(storage.dumps(data))
+    doc["days"]["bonus"][1] = 99                       # bonus spoza rejestru
+    other = storage.empty_data()
+    rows = history_io.iter_import_legacy_json(io.StringIO(json.dumps(doc)))
+    assert history_io.import_days(other, rows) == (1, 1)
+    assert storage.day_count(other) == 1
+
+
+@pytest.mark.parametrize("text", ["", "{", "[1, 2]", '{"v": 2, "days": {"dates": ["2024-01-01"]}}'])
+def test_legacy_json_unreadable_document(text):
+    assert list(history_io.iter_import_legacy_json(io.StringIO(text))) == [None]
+
+
+def test_legacy_v1_skips_broken_days(data):
+    doc = {"days": {
+        "2024-03-01": {"done": {"Sen 7–8 h": True}, "water_ml": 250},
+        "2024-03-02": ["ucięty"],
+        "2024-03-03": {"done": {"Sen 7–8 h": True}, "water_ml": "x"},
+        "2024-03-04": {"water_ml": None, "bonus": "Własny bonus"},
+    }}
+    rows = history_io.iter_import_legacy_json(io.StringIO(json.dumps(doc)))
+    assert history_io.import_days(data, rows) == (2, 2)
+    assert storage.get_day(data, "2024-03-01")["done"]["Sen 7–8 h"]
+    assert storage.get_day(data, "2024-03-04")["bonus"] == "Własny bonus"
@@ -0,0 +1,95 @@
+import json
+import threading
+
+import pytest
+
+import storage
+
+
+def _v1_file(path, days):
+    path.write_text(json.dumps({"days": days, "user": {"name": "Ala"}}, indent=2), encoding="utf-8")
+
+
+def test_v1_migrates_to_columns(workdir):
+    path = workdir / "h.json"
+    _v1_file(path, {
+        "2024-01-02": {"done": {"Sen 7–8 h": True}, "water_ml": 500, "notes": "ok", "bonus": "10 min rozciągania pleców"},
+        "2024-01-01": {"done": {"Nowe zadanie": True}, "water_ml": None, "notes": "", "bonus": "Własny bonus"},
+    })
+    data = storage.read_file(path)
+
+    assert data["v"] == storage.SCHEMA_VERSION
+    assert data["days"]["dates"] == ["2024-01-01", "2024-01-02"]
+    assert data["days"]["notes"] == {"2024-01-02": "ok"}
+    assert "Nowe zadanie" in data["tasks"] and "Własny bonus" in data["bonuses"]
+
+    day = storage.get_day(data, "2024-01-02")
+    assert day["done"]["Sen 7–8 h"] and not day["done"]["Medytacja 10–15 min"]
+    assert (day["water_ml"], day["notes"], day["bonus"]) == (500, "ok", "10 min rozciągania pleców")
+    assert storage.get_day(data, "2024-01-01")["water_ml"] == 0
+
+
+def test_round_trip_through_dumps(workdir):
+    data = storage.empty_data()
+    for date in ["2024-03-02", "2024-03-01", "2024-03-03"]:
+        storage.put_day(data, date, {"done": {"2L wody": True}, "water_ml": 250, "notes": date, "bonus": ""})
+    storage.put_day(data, "2024-03-01", {"done": {}, "water_ml": 0, "notes": "", "bonus": "x"})
+
+    again = storage.migrate(json.loads(storage.dumps(data)))
+    assert again == data
+    assert storage.day_count(again) == 3
+    assert storage.get_day(again, "2024-03-01") == {
+        "done": {name: False for name in again["tasks"]}, "water_ml": 0, "notes": "", "bonus": "x",
+    }
+    assert storage.get_day(again, "2024-03-04") is None
+    assert [d for d, _ in storage.iter_rows(again)] == ["2024-03-01", "2024-03-02", "2024-03-03"]
+
+
+@pytest.mark.parametrize("text", [
+    "{broken",
+    json.dumps({"v": 2, "days": {"dates": ["2024-01-01"], "mask": [], "water": [0], "bonus": [0], "notes": {}}}),
+    json.dumps({"v": 2, "days": {"dates": ["2024-01-02", "2024-01-01"], "mask": [0, 0], "water": [0, 0],
+                                 "bonus": [0, 0], "notes": {}}}),
+])
+def test_unreadable_file_is_moved_aside(workdir, text):
+    path = workdir / "h.json"
+    path.write_text(text, encoding="utf-8")
+    first = storage.read_file(path)
+    assert first["days"]["dates"] == [] and not path.exists()
+
+    path.write_text(text, encoding="utf-8")
+    storage.read_file(path)
+    backups = sorted(p.read_text(encoding="utf-8") for p in workdir.glob("h.json.*.bak"))
+    assert backups == [text, text]  # druga kopia nie nadpisała pierwszej
+
+
+def test_newer_version_is_not_touched(workdir):
+    path = workdir / "h.json"
+    path.write_text(json.dumps({"v": 99}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        storage.read_file(path)
+    assert path.exists()
+
+
+def test_concurrent_put_day_keeps_columns_consistent():
+    data = storage.empty_data()
+
+    def worker(t):
+        for i in range(50):
+            date = f"2024-{1 + i % 12:02d}-{1 + t:02d}"
+            storage.put_day(data, date, {"done": {f"Zadanie {t}-{i % 5}": True}, "water_ml": i,
+                                         "notes": "", "bonus": f"Bonus {t}"})
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    days = data["days"]
+    assert len({len(days[c]) for c in ("dates", *storage.DAY_COLUMNS)}) == 1
+    assert days["dates"] == sorted(set(days["dates"]))
+    assert len(data["tasks"]) == len(set(data["tasks"]))
+    assert len(data["bonuses"]) == len(set(data["bonuses"]))
+    for t in range(8):
+        assert f"Zadanie {t}-0" in storage.get_day(data, f"2024-01-{1 + t:02d}")["done"]
@@ -0,0 +1,40 @@
+import io
+import wave
+
+import pytest
+
+import tts_backends
+from tts_backends import CachedBackend, FakeBackend, get_backend
+
+
+def test_fake_backend_is_deterministic_wav():
+    backend = FakeBackend()
+    audio = backend.synthesize("Weź głęboki wdech.")
+    assert audio == backend.synthesize("Weź głęboki wdech.")
+    assert audio != backend.synthesize("Powoli wypuść powietrze.")
+
+    with wave.open(io.BytesIO(audio)) as w:
+        assert (w.getnchannels(), w.getsampwidth(), w.getframerate()) == (1, 2, FakeBackend.FRAME_RATE)
+        ms = w.getnframes() * 1000 // w.getframerate()
+    assert ms == FakeBackend.MS_PER_CHAR * len("Weź głęboki wdech.")
+
+
+def test_fake_backend_flags():
+    backend = get_backend("fake")
+    assert isinstance(backend, FakeBackend)
+    assert backend.available() and backend.offline and backend.deterministic and backend.format == "wav"
+
+
+def test_get_backend_from_env(monkeypatch):
+    monkeypatch.setenv(tts_backends.ENV_VAR, " Fake ")
+    assert isinstance(get_backend(), FakeBackend)
+    with pytest.raises(ValueError, match="Nieznany backend"):
+        get_backend("nie-ma-takiego")
+
+
+def test_cached_backend_synthesizes_once(tmp_path):
+    backend = CachedBackend(FakeBackend(), cache_dir=tmp_path)
+    first = backend.synthesize("Cisza.")
+    assert backend.synthesize("Cisza.") == first
+    assert (backend.hits, backend.misses) == (1, 1)
+    assert [p.suffix for p in tmp_path.iterdir()] == [".wav"]
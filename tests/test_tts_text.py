@@ -0,0 +1,63 @@
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+
+from tts_text import normalize_for_tts, split_pauses, split_sentences
+
+# stare clean_markdown_for_tts + strip_pause_words żyją w benchu — to nasza wyrocznia
+_spec = importlib.util.spec_from_file_location(
+    "bench_tts_text", Path(__file__).resolve().parent.parent / "bench" / "bench_tts_text.py"
+)
+bench_tts_text = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench_tts_text)
+
+# Słowa oddzielone białym znakiem albo Markdown, bez emoji. Stary regex pauz nie
+# pilnował granic słów ('zapauza 3', 'pauza 5 spokój' -> 'pokój'), więc takich
+# sklejeń tu nie ma — tam nowy wynik celowo się różni.
+TOKENS = [
+    "pauza", "Pauza", "pauza 5", "pauza 3 sekundy", "pauza 2s", "(pauza 3s)", "[pauza 10]", "[ pauza 4 sek ]",
+    "_pauza_", "pauza_5", "**pauza**", "`pauza 3`", "#", "##", ">", "*", "_", "`",
+    "oddech", "Weź", "wdech.", "ok!", "cisza…", "[link](http://x)", "[tekst]", "(nawias)",
+    "3", "10", ".", ",", "-", "p", "up",
+]
+SEPARATORS = [" ", "  ", "\n", "\t", "_", "*", "**", "` ", " > "]
+
+
+def _random_text(rnd):
+    return "".join(rnd.choice(TOKENS) + rnd.choice(SEPARATORS) for _ in range(rnd.randint(1, 10)))
+
+
+def test_matches_legacy_on_random_text():
+    rnd = random.Random(27)
+    for _ in range(3000):
+        text = _random_text(rnd)
+        assert normalize_for_tts(text) == bench_tts_text.legacy(text), text
+
+
+def test_matches_legacy_on_bench_corpus():
+    text = bench_tts_text.corpus(20_000)
+    assert normalize_for_tts(text) == bench_tts_text.legacy(text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Oddychaj. _pauza_ Dalej.", "Oddychaj. Dalej."),
+    ("Wdech pauza_5 wydech", "Wdech wydech"),
+    ("**[PAUZA 10]** Dalej", "Dalej"),
+    ("Zapauzowany napauza", "Zapauzowany napauza"),
+    ("Zobacz [nagranie](https://x.pl/a) teraz", "Zobacz nagranie teraz"),
+    ("Spokój 🌿 i cisza", "Spokój i cisza"),
+])
+def test_normalize(text, expected):
+    assert normalize_for_tts(text) == expected
+
+
+def test_split_sentences_drops_empty():
+    assert split_sentences("Wdech. [PAUZA 5] … Wydech!  Koniec") == ["Wdech.", "Wydech!", "Koniec"]
+
+
+def test_split_pauses():
+    assert split_pauses("Wdech. [PAUZA 5] Wydech _pauza 2s_ koniec") == [
+        ("Wdech. ", 5), (" Wydech _", 2), ("_ koniec", 0),
+    ]
@@ -0,0 +1,157 @@
+# tts_backends.py — silniki TTS za wspólnym interfejsem
+#
+#   backend.synthesize(tekst) -> bajty audio w formacie backend.format ("mp3"/"wav")
+#
+# Wybór na poziomie wdrożenia: zmienna środowiskowa QUESTAPP_TTS_BACKEND
+# (gtts | espeak | fake), domyślnie gtts.
+import hashlib
+import math
+import os
+import struct
+import subprocess
+import wave
+from io import BytesIO
+from pathlib import Path
+from shutil import which
+
+DEFAULT_BACKEND = "gtts"
+ENV_VAR = "QUESTAPP_TTS_BACKEND"
+
+
+class TTSBackend:
+    """Bazowa klasa silnika. Flagi opisują, czego można się po nim spodziewać."""
+
+    name = "base"
+    label = "?"
+    format = "mp3"          # format zwracanych bajtów
+    offline = False         # działa bez sieci
+    deterministic = False   # ten sam tekst -> te same bajty (można cache'ować i testować)
+
+    def available(self) -> bool:
+        return True
+
+    def synthesize(self, text: str) -> bytes:
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS — jedno zapytanie sieciowe na kawałek tekstu."""
+
+    name = "gtts"
+    label = "gTTS (Google, online)"
+    format = "mp3"
+
+    def __init__(self, lang: str = "pl"):
+        self.lang = lang
+
+    def available(self) -> bool:
+        try:
+            import gtts  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def synthesize(self, text: str) -> bytes:
+        from gtts import gTTS
+
+        buf = BytesIO()
+        gTTS(text, lang=self.lang).write_to_fp(buf)
+        return buf.getvalue()
+
+
+class EspeakBackend(TTSBackend):
+    """Lokalny espeak-ng (albo stary espeak) z CLI — bez sieci, WAV na stdout."""
+
+    name = "espeak"
+    label = "espeak-ng (lokalnie, offline)"
+    format = "wav"
+    offline = True
+    deterministic = True
+
+    def __init__(self, voice: str = "pl", speed_wpm: int = 140):
+        self.voice = voice
+        self.speed_wpm = speed_wpm
+        self.cli = which("espeak-ng") or which("espeak")
+
+    def available(self) -> bool:
+        return self.cli is not None
+
+    def synthesize(self, text: str) -> bytes:
+        if self.cli is None:
+            raise RuntimeError("Nie znaleziono espeak-ng ani espeak w PATH.")
+        res = subprocess.run(
+            [self.cli, "-v", self.voice, "-s", str(self.speed_wpm), "--stdout"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            check=True,
+        )
+        return res.stdout
+
+
+class FakeBackend(TTSBackend):
+    """Deterministyczny ton zamiast mowy — do testów i środowisk bez sieci/espeaka."""
+
+    name = "fake"
+    label = "Fake (ton testowy)"
+    format = "wav"
+    offline = True
+    deterministic = True
+
+    FRAME_RATE = 16000
+    MS_PER_CHAR = 55  # mniej więcej tempo spokojnego czytania
+
+    def synthesize(self, text: str) -> bytes:
+        n = self.FRAME_RATE * self.MS_PER_CHAR * max(1, len(text)) // 1000
+        # wysokość tonu zależy od tekstu, żeby różne kawałki dało się odróżnić
+        freq = 200 + int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:4], 16) % 400
+        step = 2 * math.pi * freq / self.FRAME_RATE
+        frames = struct.pack(f"<{n}h", *(int(8000 * math.sin(step * i)) for i in range(n)))
+
+        buf = BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.FRAME_RATE)
+            w.writeframes(frames)
+        return buf.getvalue()
+
+
+class CachedBackend(TTSBackend):
+    """Nakładka na dowolny backend: ten sam tekst -> audio z dysku zamiast ponownej syntezy."""
+
+    def __init__(self, inner: TTSBackend, cache_dir: Path = Path("meditations") / "tts_cache"):
+        self.inner = inner
+        self.cache_dir = cache_dir
+        self.name, self.label, self.format = inner.name, inner.label, inner.format
+        self.offline, self.deterministic = inner.offline, inner.deterministic
+        self.hits = 0
+        self.misses = 0
+
+    def available(self) -> bool:
+        return self.inner.available()
+
+    def synthesize(self, text: str) -> bytes:
+        key = hashlib.sha256(f"{self.inner.name}|{text}".encode("utf-8")).hexdigest()
+        path = self.cache_dir / f"{key}.{self.format}"
+        if path.exists():
+            self.hits += 1
+            return path.read_bytes()
+        self.misses += 1
+        audio = self.inner.synthesize(text)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)
+        return audio
+
+
+BACKENDS = {cls.name: cls for cls in (GTTSBackend, EspeakBackend, FakeBackend)}
+
+
+def get_backend(name: str | None = None) -> TTSBackend:
+    """Backend z argumentu albo z QUESTAPP_TTS_BACKEND; nieznana nazwa -> ValueError."""
+    name = (name or os.environ.get(ENV_VAR) or DEFAULT_BACKEND).strip().lower()
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Nieznany backend TTS: {name!r} (dostępne: {', '.join(BACKENDS)})") from None
@@ -0,0 +1,208 @@
+# tts_text.py — przygotowanie tekstu medytacji pod TTS
+#
+# Jedno przejście po tekście (zamiast 7 osobnych re.sub):
+#   - znaczniki Markdown  * _ ` # >        -> spacja
+#   - linki [tekst](url)                   -> tekst
+#   - emoji / ikony                        -> spacja
+#   - pauzy: 'pauza', 'pauza 5 sekund', '(pauza 3s)', '[PAUZA 10]' -> spacja
+#   - ciągi 2+ białych znaków              -> jedna spacja, strip na końcach
+# Każdy znak jest odwiedzany stałą liczbę razy (wyszukiwania ']('/')' są
+# zapamiętywane i nie cofają się), więc czas jest liniowy względem długości.
+# Zysk jest w najgorszym przypadku (wiele '[' bez '](' w linii), nie na zwykłym
+# tekście: tam pętla w Pythonie przegrywa z 7 regexami w C — ok. 229 vs 140 ms
+# na 1 MB (bench/bench_tts_text.py), przy tekstach medytacji to ułamki ms.
+#
+# split_pauses() tnie tekst na pauzach z liczbą sekund — audio wstawia tam ciszę.
+import re
+from typing import Iterator, List, Tuple
+
+_MD_CHARS = frozenset("*_`#>")
+_SENTENCE_END = frozenset(".!?…")
+_UNITS = ("sekundy", "sekund", "sek", "s")
+
+# znaki "niewidzialne" doklejane do emoji (ZWJ, selektory wariantu, keycap, tagi flag)
+_INVISIBLE = r"\u200d\ufe0e\ufe0f\u20e3\U000e0020-\U000e007f"
+_EMOJI = r"\u2600-\u27bf\u2b00-\u2bff\U0001f000-\U0001faff"
+
+# fragment bez znaków, które wymagają decyzji — kopiowany w całości
+_PLAIN_RUN = re.compile(rf"[^\s*_`#>\[\](pP{_EMOJI}{_INVISIBLE}]*")
+_WS_RUN = re.compile(r"\s+")
+_EMOJI_CHAR = re.compile(rf"[{_EMOJI}]")
+_INVISIBLE_CHAR = re.compile(rf"[{_INVISIBLE}]")
+# pauza z liczbą: 'pauza 5', 'pauza 5 sekund', '(pauza 3s)', '[PAUZA 10]'
+_TIMED_PAUSE = re.compile(
+    r"(?:[\[(]\s*)?(?<![^\W_])pauza\s*(\d+)\s*(?:sekundy|sekund|sek|s)?(?![^\W_])\s*\)?\]?",
+    re.IGNORECASE,
+)
+
+
+def _is_word(ch: str) -> bool:
+    # jak \w, ale bez '_': znaczniki Markdown (* _ ` # >) i tak zamieniamy na spację,
+    # więc '_pauza_' czy 'pauza_5' to pauza, tak jak w starym clean + strip
+    return ch.isalnum()
+
+
+def _skip_blank(text: str, j: int, n: int) -> int:
+    """Pomija białe znaki i znaczniki Markdown (stary kod widział je już jako spacje)."""
+    while j < n and (text[j].isspace() or text[j] in _MD_CHARS):
+        j += 1
+    return j
+
+
+def _match_pause(text: str, i: int, n: int) -> int:
+    """Jeśli w text[i] zaczyna się znacznik pauzy, zwraca indeks za nim; inaczej -1."""
+    j = i
+    if text.startswith("[", j):
+        j += 1
+    if text.startswith("(", j):
+        j += 1
+    bracketed = j > i
+    if bracketed:
+        j = _skip_blank(text, j, n)
+    elif i > 0 and _is_word(text[i - 1]):
+        return -1  # 'pauza' w środku innego słowa
+
+    if text[j:j + 5].lower() != "pauza":
+        return -1
+    k = j + 5
+
+    m = _skip_blank(text, k, n)
+    if m < n and text[m].isdigit():
+        # wariant z liczbą: pauza 5 / pauza 5 sekund / (pauza 3s) / [PAUZA 10]
+        while m < n and text[m].isdigit():
+            m += 1
+        m = _skip_blank(text, m, n)
+        for unit in _UNITS:
+            end = m + len(unit)
+            if text[m:end].lower() == unit and not (end < n and _is_word(text[end])):
+                m = end
+                break
+        m = _skip_blank(text, m, n)
+        if text.startswith(")", m):
+            m += 1
+        if text.startswith("]", m):
+            m += 1
+        return m
+
+    # samo słowo 'pauza' (bez liczby) — tylko jako całe słowo, bez nawiasów
+    if bracketed or (k < n and _is_word(text[k])):
+        return -1
+    return k
+
+
+def _scan(text: str) -> Iterator[str]:
+    """Jedno przejście; zwraca kolejne zdania (z białym znakiem za nimi)."""
+    n = len(text)
+    out: List[str] = []
+    ws_len = 0          # długość bieżącego ciągu białych znaków (po zamianach)
+    ws_first = " "      # pierwszy znak tego ciągu (pojedynczy biały znak zostaje jak był)
+    started = False     # czy wypisaliśmy już coś poza białymi znakami
+    last = ""           # ostatni wypisany znak nie-biały
+
+    # zapamiętane wyszukiwania do linków — indeksy tylko rosną
+    nl_at = -2
+    close_at = -2
+    paren_at = -2
+    link_close = -1     # ']' bieżącego linku
+    link_end = -1       # ')' bieżącego linku
+
+    i = 0
+    while i < n:
+        if i == link_close:
+            # koniec tekstu linku: pomijamy '](url)'
+            i = link_end + 1
+            link_close = link_end = -1
+            continue
+
+        ch = text[i]
+        if ch.isspace():
+            m_end = _WS_RUN.match(text, i).end()
+            if ws_len == 0:
+                ws_first = ch
+            ws_len += m_end - i
+            i = m_end
+            continue
+
+        if ch in _MD_CHARS or _EMOJI_CHAR.match(ch):
+            if ws_len == 0:
+                ws_first = " "
+            ws_len += 1
+            i += 1
+            continue
+
+        if _INVISIBLE_CHAR.match(ch):
+            i += 1
+            continue
+
+        if ch in "[(" or (ch in "pP" and not (i > 0 and _is_word(text[i - 1]))):
+            if ch == "[" and link_close < 0:
+                if nl_at < i and nl_at != -1:
+                    nl_at = text.find("\n", i)
+                if close_at < i and close_at != -1:
+                    close_at = text.find("](", i)
+                if close_at != -1:
+                    if paren_at < close_at + 2 and paren_at != -1:
+                        paren_at = text.find(")", close_at + 2)
+                    line_end = n if nl_at == -1 else nl_at
+                    if close_at < line_end and paren_at != -1 and paren_at < line_end:
+                        link_close, link_end = close_at, paren_at
+                        i += 1
+                        continue
+            end = _match_pause(text, i, n)
+            if end != -1:
+                if ws_len == 0:
+                    ws_first = " "
+                ws_len += 1
+                i = end
+                continue
+            chunk = ch
+            i += 1
+        else:
+            # 'p' w środku słowa nie zaczyna pauzy — kopiujemy dalej
+            m_end = _PLAIN_RUN.match(text, i + 1).end()
+            while m_end < n and text[m_end] in "pP" and _is_word(text[m_end - 1]):
+                m_end = _PLAIN_RUN.match(text, m_end + 1).end()
+            chunk = text[i:m_end]
+            i = m_end
+
+        # wypisanie zwykłego tekstu: najpierw zaległe białe znaki
+        if ws_len:
+            if started:
+                if last in _SENTENCE_END:
+                    out.append(ws_first if ws_len == 1 else " ")
+                    yield "".join(out)
+                    out = []
+                else:
+                    out.append(ws_first if ws_len == 1 else " ")
+            ws_len = 0
+        out.append(chunk)
+        started = True
+        last = chunk[-1]
+
+    if out:
+        yield "".join(out)
+
+
+def normalize_for_tts(text: str) -> str:
+    """Czyści tekst z Markdown, linków, emoji i znaczników pauz — gotowy dla gTTS."""
+    return "".join(_scan(text))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Jak normalize_for_tts, ale od razu pocięte na zdania (do syntezy kawałkami)."""
+    sentences = []
+    for s in _scan(text):
+        s = s.strip()
+        if any(ch.isalnum() for ch in s):
+            sentences.append(s)
+    return sentences
+
+
+def split_pauses(text: str) -> List[Tuple[str, int]]:
+    """Tekst pocięty na pauzach z liczbą: [(odcinek, sekundy ciszy po nim), ...]."""
+    pieces, pos = [], 0
+    for m in _TIMED_PAUSE.finditer(text):
+        pieces.append((text[pos:m.start()], int(m.group(1))))
+        pos = m.end()
+    pieces.append((text[pos:], 0))
+    return pieces
@@ -0,0 +1,28 @@
+# ui.py — drobne elementy UI wspólne dla pokoi
+import datetime as _dt
+
+import streamlit as st
+
+
+# --- Powitanie + prefix wg pory dnia ---
+def _time_prefix():
+    now = _dt.datetime.now().hour
+    if 5 <= now < 12:
+        return "Dzień dobry"
+    if 12 <= now < 18:
+        return "Cześć"
+    return "Dobry wieczór"
+
+def greet_user(prefix: str | None = None):
+    """Wyświetla powitanie z imieniem/imionami. prefix=None -> wg pory dnia."""
+    raw = (st.session_state.get("user_name") or "").strip()
+    prefix = prefix or _time_prefix()
+
+    if not raw:
+        st.markdown(f"### {prefix}! 👋")
+        st.caption("Ustaw imię na ekranie startowym lub w lewym panelu.")
+        return
+
+    parts = [p.strip().split()[0].capitalize() for p in raw.split(",") if p.strip()]
+    who = parts[0] if len(parts) == 1 else " i ".join(parts)
+    st.markdown(f"### {prefix}, {who}! 👋")